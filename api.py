@@ -1,35 +1,141 @@
-from fastapi import FastAPI, Request, Form, UploadFile, File, HTTPException, BackgroundTasks
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi import FastAPI, Request, Form, UploadFile, File, HTTPException
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
+import asyncio
+import functools
 import json
-import uuid
+import hashlib
 import os
-from json_to_cv import create_cv_for_api
-from ats_analysis import analyze_cv, analyze_cv_api
-from docx import Document
+import zipfile
 from io import BytesIO
+from typing import List
+from contextlib import asynccontextmanager
+import template_registry
+from generation_cache import GenerationCache, make_key
+from uploads import MaxBodySizeMiddleware, UploadTooLargeError, InvalidUploadError, read_upload
+import metrics
+from single_flight import SingleFlight
+from worker_pool import WorkerPool, PoolSaturatedError
+from jobs import JobStore, JobWorkers, QueueFullError
 
-app = FastAPI()
+# CPU-bound generation and analysis run here so they never block the event loop
+pool = WorkerPool.from_env()
+# Identical submissions are answered from here instead of being rendered again
+generation_cache = GenerationCache.from_env()
+# Re-checking a file that was already analyzed only redoes the filename checks; see get_analysis_cache
+analysis_cache = None
+# Identical submissions that arrive while the first is still being computed wait for its result
+generation_flight = SingleFlight("generation")
+analysis_flight = SingleFlight("ats")
+# Submissions made with "Prefer: respond-async" wait here for the job workers
+job_store = JobStore.from_env()
+job_workers = JobWorkers.from_env(job_store)
+
+# The ATS checks, spelling dictionary, tokenizer and DOCX templates are imported on first use, so a new
+# worker is ready as soon as FastAPI is. Deployments that would rather pay for them at startup call this
+# (CV_EAGER_LOAD=1 does so in the lifespan; serve.py does it once in the parent before forking).
+def warm_up():
+    import fast_render
+    import json_to_cv
+    import spelling
+    import tokenizer
+
+    get_analysis_cache()
+    spelling.warm_up()
+    tokenizer.tokenize("warm up")
+    json_to_cv.warm_up()
+    fast_render.warm_up()
+    for template_id in template_registry.available_templates():
+        template_registry.get_template(template_id)
+
+def get_analysis_cache():
+    global analysis_cache
+    if analysis_cache is None:
+        from ats_analysis import AnalysisCache
+        analysis_cache = AnalysisCache.from_env()
+    return analysis_cache
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if os.getenv("CV_EAGER_LOAD", "0") == "1":
+        warm_up()
+    import tokenizer
+    if tokenizer.get_tokenizer().name == "nltk":
+        import nltk_resources
+        missing = nltk_resources.missing_resources()
+        if missing:
+            print(f"Warning: NLTK data not found ({', '.join(missing)}). Run `python nltk_resources.py` to bundle it.")
+    pool.start()
+    # Job workers start with the first submission; jobs left queued by a previous run start them now
+    counts = await asyncio.to_thread(job_store.counts)
+    if counts.get("queued") or counts.get("running"):
+        job_workers.start()
+    yield
+    job_workers.shutdown()
+    pool.shutdown()
+
+app = FastAPI(lifespan=lifespan)
 templates = Jinja2Templates(directory="html")
+templates.env.globals["cv_templates"] = template_registry.available_templates()
 
-def delete_file(path: str):
-    try:
-        if os.path.exists(path):
-            os.remove(path)
-    except Exception as e:
-        print(f"Error deleting file {path}: {e}")
+CACHE_HITS = metrics.Counter("cv_cache_hits_total", "Cache lookups that found an entry.", ["cache"])
+CACHE_MISSES = metrics.Counter("cv_cache_misses_total", "Cache lookups that found nothing.", ["cache"])
+CACHE_HIT_RATIO = metrics.Gauge("cv_cache_hit_ratio", "Share of cache lookups that were hits.", ["cache"])
+POOL_PENDING = metrics.Gauge("cv_worker_pool_pending", "Jobs running on or waiting for a worker.")
+JOBS = metrics.Gauge("cv_jobs", "Jobs in the job store, by status.", ["status"])
+
+@metrics.add_collector
+def collect_cache_and_pool_metrics():
+    for name, hits, misses in (
+        ("generation", generation_cache.memory_hits + generation_cache.disk_hits, generation_cache.misses),
+        ("ats", analysis_cache.hits if analysis_cache else 0, analysis_cache.misses if analysis_cache else 0),
+    ):
+        CACHE_HITS.set(hits, cache=name)
+        CACHE_MISSES.set(misses, cache=name)
+        CACHE_HIT_RATIO.set(hits / (hits + misses) if hits + misses else 0, cache=name)
+    POOL_PENDING.set(pool.pending)
+    counts = job_store.counts()
+    for status in ("queued", "running", "done", "failed"):
+        JOBS.set(counts.get(status, 0), status=status)
+
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+EXAMPLE_JSON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cv_data.example.json")
+
+# Serialize the example CV once; every /download-json hit serves these bytes
+def load_example_json(path=EXAMPLE_JSON_PATH):
+    with open(path, "r", encoding="utf-8") as f:
+        body = json.dumps(json.load(f), indent=4).encode("utf-8")
+    return body, '"' + hashlib.sha256(body).hexdigest() + '"'
+
+EXAMPLE_JSON, EXAMPLE_JSON_ETAG = load_example_json()
+
+def busy_response(request: Request, error: str):
+    return templates.TemplateResponse("page.html", {
+        "request": request,
+        "json_output": None,
+        "error": error
+    }, status_code=503, headers={"Retry-After": "5"})
 
 @app.get("/", response_class=HTMLResponse)
 async def form_page(request: Request):
     return templates.TemplateResponse("page.html", {"request": request, "json_output": None})
 
+async def render_cv(cache_key, json_data, template, engine):
+    docx_bytes = await pool.run(template_registry.render, json_data, template, engine)
+    await generation_cache.put_async(cache_key, docx_bytes)
+    return docx_bytes
+
 @app.post("/", response_class=HTMLResponse)
 async def handle_upload(
     request: Request,
-    background_tasks: BackgroundTasks,
     json_file: UploadFile = File(None),
-    json_text: str = Form("")
+    json_text: str = Form(""),
+    template: str = Form(template_registry.DEFAULT_TEMPLATE),
+    engine: str = Form(template_registry.DEFAULT_ENGINE)
 ):
+    if prefers_async(request):
+        return await submit_generation_job(json_file, json_text, template, engine)
+
     json_data = None
     error = None
 
@@ -47,19 +153,38 @@ async def handle_upload(
                 "error": error
             })
 
-        output_path = f"/tmp/cv_{uuid.uuid4()}.docx"
-        create_cv_for_api(json_data, output_path)
+        try:
+            template_registry.check_engine(template, engine)
+            template_registry.validate(json_data, template)
+        except (template_registry.UnknownTemplateError, template_registry.InvalidCVDataError) as e:
+            metrics.ERRORS.inc(endpoint="/", kind="invalid_input")
+            return templates.TemplateResponse("page.html", {
+                "request": request,
+                "json_output": None,
+                "error": str(e)
+            }, status_code=400)
 
-        # Schedule background deletion AFTER response is sent
-        background_tasks.add_task(delete_file, output_path)
+        # Both engines produce the same document, so the key only needs the template
+        cache_key = make_key(json_data, template)
+        docx_bytes = await generation_cache.get_async(cache_key)
+        cache_status = "HIT"
+        if docx_bytes is None:
+            # Generated in memory and sent straight back
+            docx_bytes = await generation_flight.run(cache_key, render_cv, cache_key, json_data, template, engine)
+            cache_status = "MISS"
 
-        return FileResponse(
-            path=output_path,
-            filename="cv.docx",
-            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+        return Response(
+            content=docx_bytes,
+            media_type=DOCX_MEDIA_TYPE,
+            headers={"Content-Disposition": "attachment; filename=cv.docx", "X-Cache": cache_status}
         )
 
+    except PoolSaturatedError as e:
+        metrics.ERRORS.inc(endpoint="/", kind="busy")
+        return busy_response(request, str(e))
+
     except Exception as e:
+        metrics.ERRORS.inc(endpoint="/", kind="invalid_input")
         error = f"Invalid JSON: {e}"
         return templates.TemplateResponse("page.html", {
             "request": request,
@@ -68,50 +193,105 @@ async def handle_upload(
         })
 
 MAX_DOCX_SIZE_MB = 12
+MAX_DOCX_SIZE = MAX_DOCX_SIZE_MB * 1024 * 1024
+# Room for the multipart boundaries and headers around the file
+MULTIPART_OVERHEAD = 64 * 1024
 
-@app.post("/ats-check", response_class=HTMLResponse)
-async def ats_check(
-    request: Request,
-    cv_file: UploadFile = File(...)
-):
+async def analyze_upload(contents: bytes, filename: str):
+    from ats_analysis import build_report
+
+    cache = get_analysis_cache()
+    key = cache.key(contents)
+    content = cache.get(key)
+    cached = content is not None
+    if not cached:
+        content = await analysis_flight.run(key, analyze_and_cache, key, contents, filename)
+    return build_report(content, filename, cached=cached)
+
+async def analyze_and_cache(key, contents, filename):
+    from ats_analysis import analyze_content
+
+    content = await pool.run(analyze_content, contents, filename)
+    get_analysis_cache().put(key, content)
+    return content
+
+# Validates one uploaded CV and returns its bytes; raises HTTPException for anything the client got wrong
+async def read_cv_upload(cv_file: UploadFile):
+    from document_snapshot import InvalidDocumentError, check_archive
+
+    original_filename = cv_file.filename or ""
+
+    # Extension Check
+    if not original_filename.lower().endswith('.docx'):
+        raise HTTPException(status_code=400, detail="Invalid file type. Please upload a .docx file.")
+
+    # Content Type Check
+    if cv_file.content_type != DOCX_MEDIA_TYPE:
+        raise HTTPException(status_code=400, detail="Invalid content type. Only DOCX files are allowed.")
+
+    # Size and magic bytes are checked while reading, so bogus uploads are never fully buffered
     try:
-        original_filename = cv_file.filename or ""
-        
-        # Extension Check
-        if not original_filename.lower().endswith('.docx'):
-            raise HTTPException(status_code=400, detail="Invalid file type. Please upload a .docx file.")
+        contents = await read_upload(cv_file, MAX_DOCX_SIZE)
+    except (UploadTooLargeError, InvalidUploadError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        # Content Type Check
-        if cv_file.content_type != "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-            raise HTTPException(status_code=400, detail="Invalid content type. Only DOCX files are allowed.")
+    # A broken DOCX (or a zip bomb) is reported as a validation error before anything is parsed
+    try:
+        check_archive(contents)
+    except InvalidDocumentError as e:
+        raise HTTPException(status_code=400, detail=f"Uploaded file is not a valid DOCX: {e}")
+    return contents
 
-        contents = await cv_file.read()
+# Validates and analyzes one uploaded CV
+async def check_cv_upload(cv_file: UploadFile):
+    from document_snapshot import InvalidDocumentError
 
-        # File Size Check
-        if len(contents) > MAX_DOCX_SIZE_MB * 1024 * 1024:
-            raise HTTPException(status_code=400, detail="File too large. Max allowed size is 5MB.")
+    contents = await read_cv_upload(cv_file)
+    try:
+        return await analyze_upload(contents, cv_file.filename or "")
+    except InvalidDocumentError as e:
+        raise HTTPException(status_code=400, detail=f"Uploaded file is not a valid DOCX: {e}")
 
-        # Validate DOCX structure
-        try:
-            doc = Document(BytesIO(contents))  # Try opening it directly
-        except Exception as e:
-            raise HTTPException(status_code=400, detail=f"Uploaded file is not a valid DOCX: {e}")
+@app.post("/api/ats-check")
+async def ats_check_json(request: Request, cv_file: UploadFile = File(...)):
+    """Returns the ATS report as JSON: one entry per check with id, passed, value, threshold, message and seconds."""
+    if prefers_async(request):
+        return await submit_ats_job(cv_file)
+    try:
+        return await check_cv_upload(cv_file)
+    except PoolSaturatedError as e:
+        metrics.ERRORS.inc(endpoint="/api/ats-check", kind="busy")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except HTTPException:
+        metrics.ERRORS.inc(endpoint="/api/ats-check", kind="invalid_input")
+        raise
 
-        # Save to temp location (you still need the file path for downstream use)
-        temp_path = f"/tmp/{uuid.uuid4()}.docx"
-        with open(temp_path, "wb") as f:
-            f.write(contents)
+@app.post("/ats-check", response_class=HTMLResponse)
+async def ats_check(
+    request: Request,
+    cv_file: UploadFile = File(...)
+):
+    if prefers_async(request):
+        return await submit_ats_job(cv_file)
+    try:
+        from ats_analysis import format_report
 
-        ats_result = analyze_cv_api(temp_path, original_filename)
+        # Same report as /api/ats-check, shown as text
+        report = await check_cv_upload(cv_file)
 
         return templates.TemplateResponse("page.html", {
             "request": request,
             "json_output": None,
-            "ats_result": ats_result
+            "ats_result": format_report(report)
         })
 
+    except PoolSaturatedError as e:
+        metrics.ERRORS.inc(endpoint="/ats-check", kind="busy")
+        return busy_response(request, str(e))
+
     except HTTPException as he:
         # Catch validation errors
+        metrics.ERRORS.inc(endpoint="/ats-check", kind="invalid_input")
         return templates.TemplateResponse("page.html", {
             "request": request,
             "json_output": None,
@@ -121,119 +301,352 @@ async def ats_check(
 
     except Exception as e:
         # Catch unexpected errors
+        metrics.ERRORS.inc(endpoint="/ats-check", kind="internal")
         return templates.TemplateResponse("page.html", {
             "request": request,
             "json_output": None,
             "ats_result": None,
             "error": f"Failed to analyze CV: {e}"
         })
-    finally:
-        # Clean up temp file if it was created
-        if temp_path and os.path.exists(temp_path):
-            os.remove(temp_path)
 
-@app.get("/download-json")
-async def download_example_json():
-    example_data = {
-        "name": "John Doe",
-        "contact": "Somewhere, Earth",
-        "phone": "+00-1234 567 890",
-        "email": "johndoe@example.com",
-        "location": "Somewhere, Earth",
-        "job_title": "Software Engineer",
-        "summary": "Experienced software engineer with a passion for building scalable applications, optimizing infrastructure, and enhancing user experiences. Skilled in full-stack development, security, and automation.",
-        "personal_info": {},
-        "strengths_and_expertise": [],
-        "experience": [
-            {
-                "title": "Software Engineer",
-                "company": "Tech Solutions Inc.",
-                "dates": "Jan 2022 - Present",
-                "description": {
-                    "intro": "Developed and maintained web applications, optimized performance, and enhanced security.",
-                    "details": [
-                        "Designed and implemented scalable web applications.",
-                        "Managed cloud infrastructure and security measures.",
-                        "Collaborated with teams to improve UI/UX design.",
-                        "Developed automation scripts for deployment and monitoring."
-                    ]
-                }
-            },
-            {
-                "title": "Full Stack Developer",
-                "company": "Innovate Tech",
-                "dates": "Aug 2020 - Dec 2021",
-                "description": {
-                    "intro": "Worked on developing web applications using modern JavaScript frameworks and backend technologies.",
-                    "details": [
-                        "Built and maintained web applications using React and Node.js.",
-                        "Optimized database queries for better performance.",
-                        "Implemented CI/CD pipelines for automated deployment.",
-                        "Conducted security audits and implemented fixes."
-                    ]
-                }
-            }
-        ],
-        "education": [
-            {
-                "degree": "Bachelor of Science in Computer Science",
-                "institution": "Global University",
-                "year": "2018"
-            }
-        ],
-        "skills": [
-            {
-                "category": "Frontend Development",
-                "items": [
-                    "HTML & CSS",
-                    "JavaScript & TypeScript",
-                    "React & Vue.js",
-                    "Responsive Design",
-                    "UI/UX Design"
-                ]
-            },
-            {
-                "category": "Backend Development",
-                "items": [
-                    "Node.js & Express",
-                    "Python & Django",
-                    "SQL & NoSQL Databases",
-                    "REST & GraphQL APIs",
-                    "Authentication & Security"
-                ]
-            },
-            {
-                "category": "DevOps & Cloud",
-                "items": [
-                    "Docker & Kubernetes",
-                    "AWS & Azure",
-                    "CI/CD Pipelines",
-                    "Linux Server Administration",
-                    "Monitoring & Logging"
-                ]
-            },
-            {
-                "category": "Soft Skills",
-                "items": [
-                    "Problem Solving",
-                    "Team Collaboration",
-                    "Communication",
-                    "Leadership",
-                    "Adaptability"
-                ]
-            }
+MAX_BATCH_FILES = 1000
+MAX_BATCH_ARCHIVE_SIZE_MB = 200
+
+# Expand a batch upload into (filename, read, error) entries; ZIP archives contribute their members.
+# Uploads are closed once the handler returns, so their bytes are taken now; ZIP members stay
+# compressed until their turn comes. Parsing and inflating run in threads, off the event loop.
+async def batch_entries(cv_files):
+    entries = []
+    for upload in cv_files:
+        filename = upload.filename or ""
+        is_archive = filename.lower().endswith(".zip")
+        if not is_archive and not filename.lower().endswith(".docx"):
+            entries.append((filename, None, "Invalid file type. Please upload a .docx file."))
+            continue
+        try:
+            contents = await read_upload(upload, MAX_BATCH_ARCHIVE_SIZE_MB * 1024 * 1024 if is_archive else MAX_DOCX_SIZE)
+        except UploadTooLargeError as e:
+            entries.append((filename, None, str(e)))
+            continue
+        except InvalidUploadError as e:
+            entries.append((filename, None, f"Invalid ZIP archive: {e}" if is_archive else str(e)))
+            continue
+        if not is_archive:
+            entries.append((filename, lambda data=contents: data, None))
+            continue
+
+        try:
+            archive = await asyncio.to_thread(zipfile.ZipFile, BytesIO(contents))
+        except zipfile.BadZipFile as e:
+            entries.append((filename, None, f"Invalid ZIP archive: {e}"))
+            continue
+        for info in archive.infolist():
+            if info.is_dir() or info.filename.startswith("__MACOSX/") or os.path.basename(info.filename).startswith("."):
+                continue
+            error = None
+            if info.file_size > MAX_DOCX_SIZE:
+                error = f"File too large. Max allowed size is {MAX_DOCX_SIZE_MB}MB."
+            entries.append((info.filename, functools.partial(archive.read, info), error))
+    return entries
+
+async def analyze_batch_entry(index, filename, read, error, semaphore):
+    from document_snapshot import InvalidDocumentError
+
+    record = {"index": index, "filename": filename}
+    async with semaphore:
+        try:
+            if error:
+                raise ValueError(error)
+            if not filename.lower().endswith(".docx"):
+                raise ValueError("Invalid file type. Please upload a .docx file.")
+            contents = await asyncio.to_thread(read)
+            if len(contents) > MAX_DOCX_SIZE:
+                raise ValueError(f"File too large. Max allowed size is {MAX_DOCX_SIZE_MB}MB.")
+
+            record["result"] = await analyze_upload(contents, os.path.basename(filename))
+            record["status"] = "ok"
+        except InvalidDocumentError as e:
+            metrics.ERRORS.inc(endpoint="/ats-check/batch", kind="invalid_input")
+            record.update(status="error", error=f"Uploaded file is not a valid DOCX: {e}")
+        except PoolSaturatedError as e:
+            metrics.ERRORS.inc(endpoint="/ats-check/batch", kind="busy")
+            record.update(status="error", error=str(e))
+        except Exception as e:
+            metrics.ERRORS.inc(endpoint="/ats-check/batch", kind="invalid_input")
+            record.update(status="error", error=str(e))
+    return record
+
+@app.post("/ats-check/batch")
+async def ats_check_batch(cv_files: List[UploadFile] = File(...)):
+    """Analyzes many DOCX files (or the .docx files inside ZIP archives), streaming NDJSON as each finishes."""
+    entries = await batch_entries(cv_files)
+    if len(entries) > MAX_BATCH_FILES:
+        raise HTTPException(status_code=413, detail=f"Too many files. Max {MAX_BATCH_FILES} per batch.")
+
+    # Keep each batch to one job per worker so it cannot fill the shared queue on its own
+    semaphore = asyncio.Semaphore(max(pool.max_workers, 1))
+
+    async def results():
+        tasks = [
+            asyncio.ensure_future(analyze_batch_entry(index, filename, read, error, semaphore))
+            for index, (filename, read, error) in enumerate(entries)
         ]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield json.dumps(await finished) + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+@app.post("/api/keyword-match")
+async def keyword_match_json(
+    job_description: str = Form(...),
+    cv_files: List[UploadFile] = File([]),
+    cv_json: str = Form(""),
+    top: int = Form(0)
+):
+    """Ranks CVs against a job description by TF-IDF cosine similarity and lists their missing keywords.
+
+    CVs come as DOCX uploads and/or ``cv_json``: one generation profile or a list of them.
+    """
+    from document_snapshot import InvalidDocumentError
+
+    documents = await read_docx_uploads(cv_files)
+    profiles = parse_profiles(cv_json)
+    if not documents and not profiles:
+        raise HTTPException(status_code=400, detail="No CVs provided")
+
+    # NumPy and SciPy are only imported once someone uses keyword matching
+    import keyword_match
+    try:
+        results = await pool.run(keyword_match.rank_documents, job_description, documents, profiles, top or None)
+    except InvalidDocumentError as e:
+        raise HTTPException(status_code=400, detail=f"Uploaded file is not a valid DOCX: {e}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except PoolSaturatedError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    return {"results": results}
+
+# CV profiles posted as JSON text: one object or a list; labelled by name
+def parse_profiles(cv_json: str):
+    if not cv_json.strip():
+        return []
+    try:
+        data = json.loads(cv_json)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+    data = data if isinstance(data, list) else [data]
+    return [((item.get("name") if isinstance(item, dict) else None) or f"profile {index}", item)
+            for index, item in enumerate(data)]
+
+async def read_docx_uploads(cv_files: List[UploadFile]):
+    if len(cv_files) > MAX_BATCH_FILES:
+        raise HTTPException(status_code=413, detail=f"Too many files. Max {MAX_BATCH_FILES} per batch.")
+    documents = []
+    for upload in cv_files:
+        try:
+            documents.append((upload.filename or "", await read_upload(upload, MAX_DOCX_SIZE)))
+        except (UploadTooLargeError, InvalidUploadError) as e:
+            raise HTTPException(status_code=400, detail=f"{upload.filename}: {e}")
+    return documents
+
+# (label, text) pairs for the index from DOCX uploads and posted profiles
+async def index_items(cv_files: List[UploadFile], cv_json: str):
+    import cv_index
+    from document_snapshot import InvalidDocumentError
+    from keyword_match import profile_text
+
+    documents = await read_docx_uploads(cv_files)
+    items = [(label, profile_text(data)) for label, data in parse_profiles(cv_json)]
+    if not documents and not items:
+        raise HTTPException(status_code=400, detail="No CVs provided")
+    try:
+        if documents:
+            items += await pool.run(cv_index.extract_texts, documents)
+    except InvalidDocumentError as e:
+        raise HTTPException(status_code=400, detail=f"Uploaded file is not a valid DOCX: {e}")
+    except PoolSaturatedError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    return items
+
+@app.post("/api/cv-index")
+async def cv_index_add(cv_files: List[UploadFile] = File([]), cv_json: str = Form("")):
+    """Adds CVs (DOCX uploads and/or generation profiles) to the persistent index used by /api/cv-index/rank.
+
+    Each CV gets its own ID, even when its label or text matches another CV's.
+    """
+    import cv_index
+    items = await index_items(cv_files, cv_json)
+    index = cv_index.get_index()
+    ids = await asyncio.to_thread(index.add_many, items)
+    return {"added": [{"id": cv_id, "label": label} for cv_id, (label, _) in zip(ids, items)],
+            "documents": (await asyncio.to_thread(index.stats))["documents"]}
+
+@app.put("/api/cv-index/{cv_id}")
+async def cv_index_replace(cv_id: str, cv_files: List[UploadFile] = File([]), cv_json: str = Form("")):
+    """Replaces the indexed CV with this ID by one DOCX upload or profile."""
+    import cv_index
+    items = await index_items(cv_files, cv_json)
+    if len(items) != 1:
+        raise HTTPException(status_code=400, detail="Send exactly one CV to replace an indexed one")
+    label, text = items[0]
+    if not await asyncio.to_thread(cv_index.get_index().replace, cv_id, label, text):
+        raise HTTPException(status_code=404, detail="CV not found")
+    return {"id": cv_id, "label": label}
+
+@app.delete("/api/cv-index/{cv_id}")
+async def cv_index_remove(cv_id: str):
+    import cv_index
+    if not await asyncio.to_thread(cv_index.get_index().remove, cv_id):
+        raise HTTPException(status_code=404, detail="CV not found")
+    return {"id": cv_id, "removed": True}
+
+@app.get("/api/cv-index")
+async def cv_index_stats():
+    import cv_index
+    return await asyncio.to_thread(cv_index.get_index().stats)
+
+@app.post("/api/cv-index/rank")
+async def cv_index_rank(job_description: str = Form(...), top: int = Form(20)):
+    """Top-K indexed CVs for a job description (BM25), with matched and missing keywords. Reads no DOCX."""
+    import cv_index
+    try:
+        candidates = await asyncio.to_thread(cv_index.get_index().rank, job_description, max(1, min(top, 1000)))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"results": [candidate._asdict() for candidate in candidates]}
+
+# Job mode: "Prefer: respond-async" on /, /ats-check or /api/ats-check (or a POST to /api/jobs/...)
+# answers 202 with a job ID at once; the work is done by the job workers and fetched from /api/jobs/{id}
+MAX_JOB_WAIT = 60
+JOB_POLL_INTERVAL = 0.1
+
+def prefers_async(request: Request):
+    return "respond-async" in request.headers.get("prefer", "").lower()
+
+def job_view(job):
+    view = {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "attempts": job.attempts,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+        "error": job.error,
+        "status_url": f"/api/jobs/{job.id}",
     }
+    if job.status == "done":
+        view["result_url"] = f"/api/jobs/{job.id}/result"
+    return view
+
+async def submit_job(kind, payload, params, result=None):
+    try:
+        job_id = await asyncio.to_thread(job_store.submit, kind, payload, params, result)
+    except QueueFullError as e:
+        metrics.ERRORS.inc(endpoint=f"/api/jobs/{kind}", kind="busy")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    job_workers.start()
+    return JSONResponse(job_view(await asyncio.to_thread(job_store.get, job_id)), status_code=202, headers={"Location": f"/api/jobs/{job_id}"})
+
+@app.post("/api/jobs/generate", status_code=202)
+async def submit_generation_job(
+    json_file: UploadFile = File(None),
+    json_text: str = Form(""),
+    template: str = Form(template_registry.DEFAULT_TEMPLATE),
+    engine: str = Form(template_registry.DEFAULT_ENGINE)
+):
+    """Queues a CV generation; the DOCX is fetched from /api/jobs/{id}/result once the job is done."""
+    try:
+        json_data = json.loads(await json_file.read() if json_file and json_file.filename else json_text)
+    except ValueError as e:
+        metrics.ERRORS.inc(endpoint="/api/jobs/generate", kind="invalid_input")
+        raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}" if json_text.strip() or json_file else "No JSON provided")
+    try:
+        template_registry.check_engine(template, engine)
+        template_registry.validate(json_data, template)
+    except (template_registry.UnknownTemplateError, template_registry.InvalidCVDataError) as e:
+        metrics.ERRORS.inc(endpoint="/api/jobs/generate", kind="invalid_input")
+        raise HTTPException(status_code=400, detail=str(e))
+
+    params = {"template": template, "engine": engine}
+    return await submit_job("generate", json.dumps(json_data).encode("utf-8"), params,
+                            await generation_cache.get_async(make_key(json_data, template)))
+
+@app.post("/api/jobs/ats-check", status_code=202)
+async def submit_ats_job(cv_file: UploadFile = File(...)):
+    """Queues an ATS check; the JSON report is fetched from /api/jobs/{id}/result once the job is done."""
+    try:
+        contents = await read_cv_upload(cv_file)
+    except HTTPException:
+        metrics.ERRORS.inc(endpoint="/api/jobs/ats-check", kind="invalid_input")
+        raise
+    from ats_analysis import build_report
+
+    filename = cv_file.filename or ""
+    cache = get_analysis_cache()
+    content = cache.get(cache.key(contents))
+    result = json.dumps(build_report(content, filename, cached=True)).encode("utf-8") if content is not None else None
+    return await submit_job("ats-check", contents, {"filename": filename}, result)
+
+@app.get("/api/jobs/{job_id}")
+async def job_status(job_id: str, wait: float = 0):
+    """Job status; with ?wait=N (seconds, up to 60) the response is held until the job finishes or N runs out."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + min(max(wait, 0), MAX_JOB_WAIT)
+    job = await asyncio.to_thread(job_store.get, job_id)
+    while job is not None and job.status in ("queued", "running") and loop.time() < deadline:
+        await asyncio.sleep(JOB_POLL_INTERVAL)
+        job = await asyncio.to_thread(job_store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job")
+    return job_view(job)
+
+@app.get("/api/jobs/{job_id}/result")
+async def job_result(job_id: str):
+    job, result = await asyncio.to_thread(job_store.result, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job")
+    if job.status == "failed":
+        raise HTTPException(status_code=422, detail=job.error)
+    if job.status != "done":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    if job.kind == "generate":
+        return Response(content=result, media_type=DOCX_MEDIA_TYPE,
+                        headers={"Content-Disposition": "attachment; filename=cv.docx"})
+    return Response(content=result, media_type="application/json")
+
+@app.get("/download-json")
+async def download_example_json(request: Request):
+    headers = {
+        "ETag": EXAMPLE_JSON_ETAG,
+        "Cache-Control": "public, max-age=3600",
+    }
+
+    # Let clients revalidate their copy without downloading it again
+    if_none_match = request.headers.get("if-none-match", "")
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    if "*" in candidates or EXAMPLE_JSON_ETAG in candidates:
+        return Response(status_code=304, headers=headers)
+
+    headers["Content-Disposition"] = "attachment; filename=example_cv.json"
+    return Response(content=EXAMPLE_JSON, media_type="application/json", headers=headers)
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    # The collectors read the job store, so the export runs off the event loop
+    return Response(content=await asyncio.to_thread(metrics.export), media_type=metrics.CONTENT_TYPE)
 
-    # Save JSON to a temporary file
-    temp_filename = f"/tmp/example_{uuid.uuid4()}.json"
-    with open(temp_filename, "w") as f:
-        json.dump(example_data, f, indent=4)
-
-    # Return the file
-    return FileResponse(
-        temp_filename,
-        filename="example_cv.json",
-        media_type="application/json",
-        headers={"Content-Disposition": "attachment; filename=example_cv.json"}
-    )
\ No newline at end of file
+# Refuse oversized bodies while they arrive instead of after Starlette has spooled them
+app.add_middleware(MaxBodySizeMiddleware, limits={
+    "/ats-check": MAX_DOCX_SIZE + MULTIPART_OVERHEAD,
+    "/api/ats-check": MAX_DOCX_SIZE + MULTIPART_OVERHEAD,
+    "/ats-check/batch": MAX_BATCH_ARCHIVE_SIZE_MB * 1024 * 1024 + MULTIPART_OVERHEAD,
+    "/api/keyword-match": MAX_BATCH_ARCHIVE_SIZE_MB * 1024 * 1024 + MULTIPART_OVERHEAD,
+    "/api/cv-index": MAX_BATCH_ARCHIVE_SIZE_MB * 1024 * 1024 + MULTIPART_OVERHEAD,
+    "/api/jobs/ats-check": MAX_DOCX_SIZE + MULTIPART_OVERHEAD,
+})
+app.add_middleware(metrics.RequestMetricsMiddleware, paths={route.path for route in app.routes})
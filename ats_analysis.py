@@ -1,160 +1,273 @@
 import os
-import docx
 import datetime
+import hashlib
 import re
-from docx.shared import RGBColor
-from spellchecker import SpellChecker
-from nltk.tokenize import word_tokenize
-import nltk
+import threading
+from collections import OrderedDict, namedtuple
 
-from docx.shared import Pt
+from spelling import get_spelling_engine
+from document_snapshot import DocumentSnapshot
+from metrics import timed
 
-nltk.download('punkt')
-nltk.download('punkt_tab')
+# Bump whenever a check or its wording changes; cached results from another ruleset are never reused
+RULESET_VERSION = "3"
+
+# Outcome of one check. value is what was measured and threshold what it is compared against,
+# both JSON-serializable; message is the line shown to people; seconds is filled in by run_check.
+CheckResult = namedtuple("CheckResult", ["id", "passed", "value", "threshold", "message", "seconds"], defaults=(None,))
+
+# Report order, with the label the text report puts in front of each message
+CHECK_LABELS = {
+    "file_type": "File Type",
+    "last_modified": "Last Modified Date",
+    "file_name": "Filename Check",
+    "file_name_length": "Filename Length Check",
+    "file_size": "File Size",
+    "word_count": None,
+    "page_count": None,
+    "font_sizes": "Font Size Check",
+    "font_types": "Font Type Check",
+    "font_colors": "Font Color Check",
+    "sections": "Sections Check",
+    "email": "Email Check",
+    "phone": "Phone Check",
+    "spelling": "Spelling Check",
+}
+CHECK_ORDER = list(CHECK_LABELS)
+
+ACCEPTED_FILE_TYPES = ['.docx', '.rtf']
+MAX_DAYS_SINCE_UPDATE = 60
+MAX_FILE_NAME_LENGTH = 24
+MAX_FILE_SIZE = 1048576
+WORD_COUNT_RANGE = [350, 800]
+PAGE_COUNT_RANGE = [1, 2]
+MAX_FONT_SIZES = 2
+STANDARD_FONTS = ['Arial', 'Calibri', 'Times New Roman']
+MAX_FONT_COLORS = 1
+REQUIRED_SECTIONS = ['experience', 'education', 'skills']
+EMAIL_PATTERN = r'[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+'
+PHONE_PATTERN = r'\b(?:\+?\d{1,4})?[\d\s\(\)-]{6,15}\b'
 
 # Function to read Word documents
 def read_docx(file_path):
-    doc = docx.Document(file_path)
-    text = '\n'.join([para.text for para in doc.paragraphs])
-    return text
+    return DocumentSnapshot.from_path(file_path).text
 
 # Check file type (Word/RTF)
-def check_file_type(file_path):
-    return "✅ File type is acceptable." if file_path.lower().endswith(('.docx', '.rtf')) else "❌ Please use a Word or RTF document."
+def check_file_type(filename):
+    extension = os.path.splitext(filename)[1].lower()
+    passed = extension in ACCEPTED_FILE_TYPES
+    return CheckResult("file_type", passed, extension, ACCEPTED_FILE_TYPES,
+                       "✅ File type is acceptable." if passed else "❌ Please use a Word or RTF document.")
 
 # Check last edited date
-def check_last_modified_date(file_path):
-    last_modified = datetime.datetime.fromtimestamp(os.path.getmtime(file_path))
-    return "✅ Your document was last updated recently (within 2 months)." if (datetime.datetime.today() - last_modified).days < 60 else "❌ Your document was last updated more than 2 months ago. Consider updating."
+def check_last_modified_date(snapshot):
+    days = (datetime.datetime.today() - snapshot.last_modified).days
+    passed = days < MAX_DAYS_SINCE_UPDATE
+    return CheckResult("last_modified", passed, days, MAX_DAYS_SINCE_UPDATE,
+                       "✅ Your document was last updated recently (within 2 months)." if passed else "❌ Your document was last updated more than 2 months ago. Consider updating.")
 
 # Check file name format
-def check_file_name(file_path, full_name):
-    file_name = os.path.basename(file_path)
-    name_check = "✅ Good job, your name is in the file name!" if full_name.lower() in file_name.lower() else "❌ Consider adding your name to the file name."
-    name_length_check = "✅ File name length is good." if len(file_name) <= 24 else "❌ Your file name is too long. Keep it concise."
-    return name_check, name_length_check
+def check_file_name(file_name, full_name):
+    passed = full_name.lower() in file_name.lower()
+    return CheckResult("file_name", passed, file_name, full_name,
+                       "✅ Good job, your name is in the file name!" if passed else "❌ Consider adding your name to the file name.")
+
+def check_file_name_length(file_name):
+    passed = len(file_name) <= MAX_FILE_NAME_LENGTH
+    return CheckResult("file_name_length", passed, len(file_name), MAX_FILE_NAME_LENGTH,
+                       "✅ File name length is good." if passed else "❌ Your file name is too long. Keep it concise.")
 
 # Check file size
-def check_file_size(file_path):
-    return "✅ File size is acceptable." if os.path.getsize(file_path) < 1048576 else "❌ Your file size is too large (over 1MB)."
+def check_file_size(snapshot):
+    passed = snapshot.size < MAX_FILE_SIZE
+    return CheckResult("file_size", passed, snapshot.size, MAX_FILE_SIZE,
+                       "✅ File size is acceptable." if passed else "❌ Your file size is too large (over 1MB).")
 
 # Count words and estimate pages
-def count_words_and_pages(text):
-    words = [word for word in word_tokenize(text) if word.isalpha()]
+def count_words_and_pages(snapshot):
+    words = [word for word in snapshot.tokens if word.isalpha()]
     word_count = len(words)
     page_count = max(1, word_count // 400)  # Approx. 400 words per page
     return word_count, page_count
 
+def check_word_count(snapshot):
+    word_count, _ = count_words_and_pages(snapshot)
+    low, high = WORD_COUNT_RANGE
+    passed = low <= word_count <= high
+    return CheckResult("word_count", passed, word_count, WORD_COUNT_RANGE,
+                       f"✅ Word count: {word_count} (Ideal: 350-800)" if passed else f"❌ Word count: {word_count} (Out of ideal range)")
+
+def check_page_count(snapshot):
+    _, page_count = count_words_and_pages(snapshot)
+    low, high = PAGE_COUNT_RANGE
+    passed = low <= page_count <= high
+    return CheckResult("page_count", passed, page_count, PAGE_COUNT_RANGE,
+                       f"✅ Estimated page count: {page_count} (Ideal: 1-2 pages)" if passed else f"❌ Estimated page count: {page_count} (Out of ideal range)")
+
 # Check font consistency
-def check_font_and_colors(file_path):
-    doc = docx.Document(file_path)
-    font_sizes, font_colors = set(), set()
-    standard_fonts = ['Arial', 'Calibri', 'Times New Roman']
-    font_ok = True
-    
-    for para in doc.paragraphs:
-        for run in para.runs:
-            if run.font:
-                if run.font.size:
-                    font_sizes.add(run.font.size.pt)
-                if run.font.color and run.font.color.rgb:
-                    font_colors.add(run.font.color.rgb)
-                if run.font.name and run.font.name not in standard_fonts:
-                    font_ok = False
-    
-    color_check = "❌ Multiple font colors detected. Use only black." if len(font_colors) > 1 else "✅ Font color is consistent."
-    size_check = "✅ Font sizes are consistent." if len(font_sizes) <= 2 else "❌ Multiple font sizes detected. Keep it consistent."
-    font_check = "✅ Standard fonts used." if font_ok else "❌ Non-standard fonts detected. Use Arial, Calibri, or Times New Roman."
-    
-    return size_check, font_check, color_check
+def check_font_sizes(snapshot):
+    font_sizes = sorted({run.size for run in snapshot.runs if run.size})
+    passed = len(font_sizes) <= MAX_FONT_SIZES
+    return CheckResult("font_sizes", passed, font_sizes, MAX_FONT_SIZES,
+                       "✅ Font sizes are consistent." if passed else "❌ Multiple font sizes detected. Keep it consistent.")
+
+def check_font_types(snapshot):
+    non_standard = sorted({run.name for run in snapshot.runs if run.name and run.name not in STANDARD_FONTS})
+    passed = not non_standard
+    return CheckResult("font_types", passed, non_standard, STANDARD_FONTS,
+                       "✅ Standard fonts used." if passed else "❌ Non-standard fonts detected. Use Arial, Calibri, or Times New Roman.")
+
+def check_font_colors(snapshot):
+    font_colors = sorted({run.color for run in snapshot.runs if run.color})
+    passed = len(font_colors) <= MAX_FONT_COLORS
+    return CheckResult("font_colors", passed, font_colors, MAX_FONT_COLORS,
+                       "✅ Font color is consistent." if passed else "❌ Multiple font colors detected. Use only black.")
 
 # Check required sections
-def check_sections(text):
-    required_sections = ['experience', 'education', 'skills']
-    missing_sections = [section for section in required_sections if section not in text.lower()]
-    return "✅ All key sections included." if not missing_sections else f"❌ Missing sections: {', '.join(missing_sections)}."
+def check_sections(snapshot):
+    text = snapshot.text.lower()
+    missing_sections = [section for section in REQUIRED_SECTIONS if section not in text]
+    passed = not missing_sections
+    return CheckResult("sections", passed, missing_sections, REQUIRED_SECTIONS,
+                       "✅ All key sections included." if passed else f"❌ Missing sections: {', '.join(missing_sections)}.")
 
 # Check contact information
-def check_contact_info(text):
-    email_pattern = r'[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+'
-    phone_pattern = r'\b(?:\+?\d{1,4})?[\d\s\(\)-]{6,15}\b'
-    emails = re.findall(email_pattern, text)
-    phones = re.findall(phone_pattern, text)
-    return ("✅ Email found." if emails else "❌ No email detected."), ("✅ Phone number found." if phones else "❌ No phone number detected.")
+def check_email(snapshot):
+    emails = re.findall(EMAIL_PATTERN, snapshot.text)
+    return CheckResult("email", bool(emails), len(emails), 1,
+                       "✅ Email found." if emails else "❌ No email detected.")
+
+def check_phone(snapshot):
+    phones = re.findall(PHONE_PATTERN, snapshot.text)
+    return CheckResult("phone", bool(phones), len(phones), 1,
+                       "✅ Phone number found." if phones else "❌ No phone number detected.")
 
 # Spell-checking
-def check_spelling(text):
-    spell = SpellChecker()
-    words = word_tokenize(text)
-    misspelled = spell.unknown(words)
-    return "✅ No spelling mistakes detected." if not misspelled else f"❌ Spelling mistakes found: {', '.join(misspelled)}"
+def check_spelling(snapshot):
+    misspelled = sorted(get_spelling_engine().unknown(snapshot.tokens))
+    return CheckResult("spelling", not misspelled, misspelled, 0,
+                       "✅ No spelling mistakes detected." if not misspelled else f"❌ Spelling mistakes found: {', '.join(misspelled)}")
+
+# Checks that only look at the document itself, in report order
+CONTENT_CHECKS = [
+    check_last_modified_date,
+    check_file_size,
+    check_word_count,
+    check_page_count,
+    check_font_sizes,
+    check_font_types,
+    check_font_colors,
+    check_sections,
+    check_email,
+    check_phone,
+    check_spelling,
+]
+
+# Runs a check, recording its duration in the result and in the ats.<check> stage metric
+def run_check(check, *args):
+    with timed(f"ats.{check.__name__}") as timer:
+        result = check(*args)
+    return result._replace(seconds=round(timer.elapsed, 6))
+
+def filename_checks(filename, full_name):
+    return [
+        run_check(check_file_type, filename),
+        run_check(check_file_name, filename, full_name),
+        run_check(check_file_name_length, filename),
+    ]
 
 # Main function to analyze the CV
 def analyze_cv(file_path, full_name):
-    text = read_docx(file_path)
-    
-    print(check_file_type(file_path))
-    print(check_last_modified_date(file_path))
-    name_check, name_length_check = check_file_name(file_path, full_name)
-    print(name_check)
-    print(name_length_check)
-    print(check_file_size(file_path))
-    
-    word_count, page_count = count_words_and_pages(text)
-    print(f"✅ Word count: {word_count} (Ideal: 350-800)" if 350 <= word_count <= 800 else f"❌ Word count: {word_count} (Out of ideal range)")
-    print(f"✅ Estimated page count: {page_count} (Ideal: 1-2 pages)" if 1 <= page_count <= 2 else f"❌ Estimated page count: {page_count} (Out of ideal range)")
-    
-    size_check, font_check, color_check = check_font_and_colors(file_path)
-    print(size_check)
-    print(font_check)
-    print(color_check)
-    
-    print(check_sections(text))
-    email_check, phone_check = check_contact_info(text)
-    print(email_check)
-    print(phone_check)
-    
-    print(check_spelling(text))
-    
+    snapshot = DocumentSnapshot.from_path(file_path)
+
+    checks = filename_checks(snapshot.filename, full_name) + [run_check(check, snapshot) for check in CONTENT_CHECKS]
+    for result in sorted(checks, key=lambda r: CHECK_ORDER.index(r.id)):
+        print(result.message)
+
     return "✅ CV analysis complete with detailed feedback."
 
 
-def analyze_cv_api(file_path, full_name):
-    result = ""
+# The part of an API report that depends only on the document's bytes
+ContentReport = namedtuple("ContentReport", ["checks", "parse_seconds"])
+
+# Parse and run every content check; raises InvalidDocumentError for non-DOCX input
+def analyze_content(contents, filename):
+    with timed("ats.parse") as parse_timer:
+        snapshot = DocumentSnapshot.from_bytes(contents, filename)
+    with timed("ats.tokenize") as tokenize_timer:
+        snapshot.tokens
+
+    checks = [run_check(check, snapshot) for check in CONTENT_CHECKS]
+    return ContentReport(checks, round(parse_timer.elapsed + tokenize_timer.elapsed, 6))
+
+# Combine the cached content checks with the filename checks, which are cheap and differ
+# between uploads of the same file, into a JSON-serializable report
+def build_report(content, filename, full_name=None, cached=False):
+    # As before, the upload's own filename stands in for the name when none is given
+    if full_name is None:
+        full_name = filename
+
+    checks = sorted(filename_checks(filename, full_name) + content.checks, key=lambda r: CHECK_ORDER.index(r.id))
+    return {
+        "filename": filename,
+        "full_name": full_name,
+        "ruleset_version": RULESET_VERSION,
+        "passed": all(result.passed for result in checks),
+        "failed_checks": [result.id for result in checks if not result.passed],
+        "cached": cached,
+        "parse_seconds": content.parse_seconds,
+        "checks": [result._asdict() for result in checks],
+    }
 
-    # Check file type and log it
-    result += f"File Type: {check_file_type(file_path)}\n"
-    result += f"Last Modified Date: {check_last_modified_date(file_path)}\n"
+# Plain-text rendering of a report, one "Label: message" line per check
+def format_report(report):
+    lines = []
+    for check in report["checks"]:
+        label = CHECK_LABELS.get(check["id"])
+        lines.append(f"{label}: {check['message']}" if label else check["message"])
+    return "\n".join(lines) + "\n"
 
-    # Check filename for the full name and length
-    name_check, name_length_check = check_file_name(file_path, full_name)
-    result += f"Filename Check: {name_check}\n"
-    result += f"Filename Length Check: {name_length_check}\n"
+# Analyze an uploaded CV straight from its bytes; raises InvalidDocumentError for non-DOCX input
+def analyze_cv_api(contents, filename, full_name=None):
+    return format_report(build_report(analyze_content(contents, filename), filename, full_name))
 
-    # Check file size
-    result += f"File Size: {check_file_size(file_path)}\n"
 
-    # Word count and page count checks
-    text = read_docx(file_path)
-    word_count, page_count = count_words_and_pages(text)
-    result += f"✅ Word count: {word_count} (Ideal: 350-800)" if 350 <= word_count <= 800 else f"❌ Word count: {word_count} (Out of ideal range)\n"
-    result += f"✅ Estimated page count: {page_count} (Ideal: 1-2 pages)" if 1 <= page_count <= 2 else f"❌ Estimated page count: {page_count} (Out of ideal range)\n"
+# ContentReports of recently checked files, keyed by ruleset version and SHA-256 of the bytes
+class AnalysisCache:
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
 
-    # Font and color checks
-    size_check, font_check, color_check = check_font_and_colors(file_path)
-    result += f"Font Size Check: {size_check}\n"
-    result += f"Font Type Check: {font_check}\n"
-    result += f"Font Color Check: {color_check}\n"
+    @classmethod
+    def from_env(cls):
+        return cls(int(os.getenv("CV_ATS_CACHE_SIZE", "1024")))
 
-    # Section check (e.g., header, skills, experience)
-    result += f"Sections Check: {check_sections(text)}\n"
+    @staticmethod
+    def key(contents):
+        return f"{RULESET_VERSION}:{hashlib.sha256(contents).hexdigest()}"
 
-    # Contact info check (email, phone)
-    email_check, phone_check = check_contact_info(text)
-    result += f"Email Check: {email_check}\n"
-    result += f"Phone Check: {phone_check}\n"
+    def get(self, key):
+        with self._lock:
+            content = self._entries.get(key)
+            if content is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return content
 
-    # Spelling check
-    result += f"Spelling Check: {check_spelling(text)}\n"
+    def put(self, key, content):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = content
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
 
-    return result
\ No newline at end of file
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,117 @@
+"""Batch CV generation: many JSON profiles in, one DOCX per profile out.
+
+Profiles come from a directory of ``*.json`` files, a glob pattern, or a JSONL
+stream (a ``.jsonl`` file or ``-`` for stdin, one profile per line, saved as
+``<line number>.docx``). A glob's matches keep their paths below the pattern's
+first wildcard, so ``cohort/**/*.json`` writes ``a/cv.docx`` and ``b/cv.docx``
+rather than one ``cv.docx``. They are rendered on a process pool. A failing
+profile is reported and skipped, and throughput statistics are printed at the
+end.
+"""
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+
+def is_glob(source):
+    return any(c in source for c in "*?[")
+
+
+# The directory part of a glob pattern before its first wildcard
+def glob_root(pattern):
+    parts = []
+    for part in os.path.dirname(pattern).split(os.sep):
+        if is_glob(part):
+            break
+        parts.append(part)
+    return os.sep.join(parts) or os.curdir
+
+
+# Yields (label, json_path, json_line, output_path, template_id, engine) for every profile in the source
+def iter_jobs(source, output_dir, template_id, engine):
+    if source == "-" or source.endswith(".jsonl"):
+        stream = sys.stdin if source == "-" else open(source, "r", encoding="utf-8")
+        try:
+            for lineno, line in enumerate(stream, start=1):
+                if line.strip():
+                    yield f"line {lineno}", None, line, os.path.join(output_dir, f"{lineno:06d}.docx"), template_id, engine
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        return
+
+    if os.path.isdir(source):
+        root, paths = source, sorted(glob.glob(os.path.join(source, "*.json")))
+    elif is_glob(source):
+        root, paths = glob_root(source), sorted(glob.glob(source, recursive=True))
+    else:
+        root, paths = os.path.dirname(source), [source]
+
+    for path in paths:
+        name = os.path.splitext(os.path.relpath(path, root or os.curdir))[0]
+        yield path, path, None, os.path.join(output_dir, name + ".docx"), template_id, engine
+
+
+# Runs in a worker process: returns (label, seconds, error message or None)
+def render_job(job):
+    import template_registry
+
+    label, json_path, json_line, output_path, template_id, engine = job
+    start = time.perf_counter()
+    try:
+        if json_path is not None:
+            with open(json_path, "r", encoding="utf-8") as f:
+                profile = json.load(f)
+        else:
+            profile = json.loads(json_line)
+        docx_bytes = template_registry.render(profile, template_id, engine)
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        with open(output_path, "wb") as f:
+            f.write(docx_bytes)
+        return label, time.perf_counter() - start, None
+    except Exception as e:
+        return label, time.perf_counter() - start, f"{type(e).__name__}: {e}"
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = round(pct / 100 * (len(sorted_values) - 1))
+    return sorted_values[index]
+
+
+def run_batch(source, output_dir, workers=None, chunksize=8, template_id="default", engine="docx"):
+    """Renders every profile in source into output_dir and returns a stats dict."""
+    os.makedirs(output_dir, exist_ok=True)
+    timings, failures = [], []
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for label, seconds, error in executor.map(render_job, iter_jobs(source, output_dir, template_id, engine), chunksize=chunksize):
+            if error:
+                failures.append((label, error))
+                print(f"FAILED {label}: {error}", file=sys.stderr)
+            else:
+                timings.append(seconds)
+    elapsed = time.perf_counter() - start
+
+    timings.sort()
+    return {
+        "generated": len(timings),
+        "failed": len(failures),
+        "failures": failures,
+        "seconds": elapsed,
+        "docs_per_sec": len(timings) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(timings, 50) * 1000,
+        "p99_ms": percentile(timings, 99) * 1000,
+    }
+
+
+def print_stats(stats):
+    print(
+        f"Generated {stats['generated']} CVs ({stats['failed']} failed) in {stats['seconds']:.2f}s: "
+        f"{stats['docs_per_sec']:.1f} docs/sec, p50 {stats['p50_ms']:.1f} ms, p99 {stats['p99_ms']:.1f} ms per doc"
+    )
@@ -0,0 +1,63 @@
+"""CV inverted index: build time, incremental adds and top-K query latency over a synthetic corpus.
+
+    python benchmarks/bench_cv_index.py [--cvs 100000] [--jobs 2] [-n 20] [--index /tmp/bench_cv_index.db]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_keyword_match import JOB_DESCRIPTION
+from corpus import profile
+from cv_index import CVIndex
+from keyword_match import profile_text
+from samples import bench
+
+OTHER_ROLES = [
+    "Frontend developer: React, TypeScript, Vue.js, CSS, accessibility, design systems and dashboard work.",
+    "Data engineer to build analytics pipelines with Python, SQL, Airflow and reporting for payments and search.",
+    "Engineering manager to lead onboarding, release quality, testing culture and mentoring across teams.",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cvs", type=int, default=100000)
+    parser.add_argument("--jobs", type=int, default=2, help="Jobs per synthetic CV")
+    parser.add_argument("-n", "--runs", type=int, default=20)
+    parser.add_argument("--index", help="Index file (default: a temporary file)")
+    parser.add_argument("--batch", type=int, default=10000, help="CVs per add_many call while building")
+    args = parser.parse_args()
+
+    path = args.index or os.path.join(tempfile.mkdtemp(), "bench_cv_index.db")
+    index = CVIndex(path)
+    existing = index.stats()["documents"]
+    if existing < args.cvs:
+        start = time.perf_counter()
+        for first in range(existing, args.cvs, args.batch):
+            last = min(first + args.batch, args.cvs)
+            index.add_many((f"cv{i}", profile_text(profile(args.jobs, seed=i))) for i in range(first, last))
+        print(f"Indexed {args.cvs - existing} CVs in {time.perf_counter() - start:.1f}s")
+    print(index.stats())
+
+    extra = iter(range(args.cvs, args.cvs + args.runs))
+
+    def add_one():
+        i = next(extra)
+        index.add(f"cv{i}", profile_text(profile(args.jobs, seed=i)))
+
+    # Includes the occasional segment merge
+    bench("add 1 CV", add_one, args.runs)
+    for number, role in enumerate([JOB_DESCRIPTION] + OTHER_ROLES):
+        bench(f"top 20, role {number}", lambda: index.rank(role, top=20), args.runs)
+
+    best = index.rank(JOB_DESCRIPTION, top=3)
+    for candidate in best:
+        print(f"{candidate.score:8.3f}  {candidate.coverage:5.0%}  {candidate.label}  missing: {', '.join(candidate.missing[:6])}")
+
+
+if __name__ == "__main__":
+    main()
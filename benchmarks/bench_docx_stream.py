@@ -0,0 +1,137 @@
+"""DOCX text extraction: python-docx object tree vs the streaming extractor (docx_stream).
+
+Builds a large CV with an embedded image, then parses it in a fresh process per
+case and reports the time and the growth in peak RSS while parsing (the lxml tree
+python-docx builds lives outside Python's allocator, so tracemalloc would miss it).
+On Linux the peak is reset after the imports, so only parsing counts; elsewhere the
+figure is measured from the import peak and understates parsing.
+
+    python benchmarks/bench_docx_stream.py [--jobs 200] [--image-mb 8] [-n 5]
+"""
+import argparse
+import os
+import resource
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+# An uncompressible RGB PNG of about the given size, so the DOCX carries a realistic photo-sized part
+def noise_png(size_bytes):
+    side = max(1, int((size_bytes / 3) ** 0.5))
+    raw = b"".join(b"\x00" + os.urandom(side * 3) for _ in range(side))
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", side, side, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw, 1)) + chunk(b"IEND", b"")
+
+
+def build_cv(path, jobs, image_mb):
+    from io import BytesIO
+
+    import docx
+    from docx.shared import Inches
+
+    from corpus import profile
+    import template_registry
+
+    doc = docx.Document(BytesIO(template_registry.render(profile(jobs))))
+    if image_mb:
+        doc.add_picture(BytesIO(noise_png(image_mb * 1024 * 1024)), width=Inches(1))
+    doc.save(path)
+
+
+def python_docx(path):
+    import docx
+    doc = docx.Document(path)
+    runs = []
+    paragraphs = [para.text for para in doc.paragraphs]
+    for para in doc.paragraphs:
+        for run in para.runs:
+            font = run.font
+            runs.append((font.name, font.size.pt if font.size else None, str(font.color.rgb) if font.color and font.color.rgb else None))
+    return paragraphs, runs
+
+
+def stream(path):
+    from document_snapshot import DocumentSnapshot
+    snapshot = DocumentSnapshot.from_path(path)
+    return snapshot.paragraphs, snapshot.runs
+
+
+CASES = {"python-docx": python_docx, "docx_stream": stream}
+
+
+# Resets the process's peak RSS to its current RSS (Linux); returns that baseline in KB, or None
+def reset_peak_rss():
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return peak_rss()
+    except OSError:
+        return None
+
+
+# Peak RSS in KB since the last reset (VmHWM), or since start where /proc is missing
+def peak_rss():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+# Runs in the child process: one case, prints "<seconds> <peak RSS growth in KB>"
+def measure(case, path, runs):
+    import docx  # noqa: F401  imported up front so module size is not counted as parsing
+    import document_snapshot  # noqa: F401
+    # ru_maxrss alone would be dominated by the import peak, which parsing may never exceed
+    before = reset_peak_rss()
+    if before is None:
+        before = peak_rss()
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        CASES[case](path)
+        timings.append(time.perf_counter() - start)
+    print(sorted(timings)[len(timings) // 2], peak_rss() - before)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=200, help="Jobs in the synthetic CV")
+    parser.add_argument("--image-mb", type=int, default=8, help="Size of the embedded image (0 for none)")
+    parser.add_argument("-n", "--runs", type=int, default=5)
+    parser.add_argument("--measure", nargs=2, metavar=("CASE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.measure[0], args.measure[1], args.runs)
+        return
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "large_cv.docx")
+        build_cv(path, args.jobs, args.image_mb)
+        print(f"{args.jobs} jobs, {args.image_mb}MB image: {os.path.getsize(path) / 1024 / 1024:.2f}MB DOCX")
+
+        for case in CASES:
+            output = subprocess.run([sys.executable, os.path.abspath(__file__), "-n", str(args.runs), "--measure", case, path],
+                                    check=True, capture_output=True, text=True).stdout.split()
+            seconds, peak_kb = float(output[0]), int(output[1])
+            print(f"{case:<12} median {seconds * 1000:8.1f} ms   peak RSS +{peak_kb / 1024:6.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
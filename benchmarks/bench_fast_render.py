@@ -0,0 +1,51 @@
+"""OOXML fast renderer vs python-docx: single-core docs/sec.
+
+Byte-level parity between the two is tested in tests/test_fast_render.py.
+
+    python benchmarks/bench_fast_render.py [-n 50] [--jobs 20]
+"""
+import argparse
+import copy
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fast_render
+import json_to_cv
+from samples import EXAMPLE_JSON
+
+
+def docs_per_sec(label, render, data, runs):
+    start = time.perf_counter()
+    for _ in range(runs):
+        render(data)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {runs / elapsed:8.1f} docs/sec   {elapsed / runs * 1000:8.2f} ms/doc")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--runs", type=int, default=50)
+    parser.add_argument("--jobs", type=int, default=20, help="Jobs in the long profile")
+    args = parser.parse_args()
+
+    with open(EXAMPLE_JSON, "r", encoding="utf-8") as f:
+        example = json.load(f)
+    long_profile = copy.deepcopy(example)
+    long_profile["experience"] = [copy.deepcopy(example["experience"][i % 2]) for i in range(args.jobs)]
+    for job in long_profile["experience"]:
+        job["description"]["details"] = job["description"]["details"] * 5
+    profiles = {"example": example, f"{args.jobs} jobs": long_profile}
+
+    json_to_cv.warm_up()
+    fast_render.warm_up()
+    for label in ("example", f"{args.jobs} jobs"):
+        docs_per_sec(f"python-docx, {label}", json_to_cv.render, profiles[label], args.runs)
+        docs_per_sec(f"ooxml, {label}", fast_render.render, profiles[label], args.runs)
+
+
+if __name__ == "__main__":
+    main()
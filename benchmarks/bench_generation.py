@@ -0,0 +1,44 @@
+"""Per-CV build time: fresh python-docx Document vs the cached, pre-styled base document.
+
+    python benchmarks/bench_generation.py [-n 50]
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx import Document
+
+import json_to_cv
+import template_cache
+from samples import EXAMPLE_JSON, bench
+
+
+def fresh_base():
+    doc = Document()
+    json_to_cv.apply_base_style(doc)
+    return doc
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    with open(EXAMPLE_JSON, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    bench("base: Document() + styling", fresh_base, args.runs)
+    bench("base: cached copy", lambda: template_cache.new_document("json_to_cv", json_to_cv.apply_base_style), args.runs)
+
+    original = template_cache.new_document
+    template_cache.new_document = lambda template_id, prepare: fresh_base()
+    bench("full CV, uncached base", lambda: json_to_cv.render_cv_for_api(data), args.runs)
+    template_cache.new_document = original
+    bench("full CV, cached base", lambda: json_to_cv.render_cv_for_api(data), args.runs)
+
+
+if __name__ == "__main__":
+    main()
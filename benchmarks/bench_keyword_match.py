@@ -0,0 +1,37 @@
+"""Keyword matching: one CV against one job description, and ranking a large synthetic corpus.
+
+    python benchmarks/bench_keyword_match.py [-n 50] [--cvs 5000] [--jobs 3]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import keyword_match
+from corpus import profile
+from samples import bench
+
+JOB_DESCRIPTION = """Senior Backend Developer. We are looking for an engineer with 5+ years of Python experience
+(Django or FastAPI), PostgreSQL and Redis, who has shipped microservices on AWS with Docker, Kubernetes and
+Terraform. You will own CI/CD pipelines, monitoring and on-call, improve latency and availability, and mentor
+junior developers. GraphQL and React are a plus."""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--runs", type=int, default=50)
+    parser.add_argument("--cvs", type=int, default=5000, help="Corpus size for the ranking benchmark")
+    parser.add_argument("--jobs", type=int, default=3, help="Jobs per synthetic CV")
+    args = parser.parse_args()
+
+    cvs = [(f"cv{i}", keyword_match.profile_text(profile(args.jobs, seed=i))) for i in range(args.cvs)]
+    tokens = sum(len(text.split()) for _, text in cvs) // len(cvs)
+
+    bench("1 CV x 1 job description", lambda: keyword_match.match(JOB_DESCRIPTION, cvs[0][1]), args.runs)
+    matcher = keyword_match.KeywordMatcher(JOB_DESCRIPTION)
+    bench(f"rank {args.cvs} CVs (~{tokens} words)", lambda: matcher.rank(cvs, top=10), max(1, args.runs // 10))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Per-request spell-check time: fresh SpellChecker per call vs the shared SpellingEngine.
+
+Run from the repository root:
+
+    python benchmarks/bench_spelling.py [-n 20]
+"""
+import argparse
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from spellchecker import SpellChecker
+from spelling import SpellingEngine
+from samples import bench, example_text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    words = re.findall(r"\w+", example_text())
+    print(f"{len(words)} tokens per request, {args.runs} requests\n")
+
+    bench("before: SpellChecker()", lambda: SpellChecker().unknown(words), args.runs)
+
+    engine = SpellingEngine()
+    engine.unknown(words)  # startup warm-up
+    bench("after: shared engine", lambda: engine.unknown(words), args.runs)
+
+    batch = [words] * 10
+    bench("after: batch of 10 docs", lambda: engine.unknown_batch(batch), args.runs)
+
+
+if __name__ == "__main__":
+    main()
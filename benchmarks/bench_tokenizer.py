@@ -0,0 +1,50 @@
+"""Regex vs NLTK tokenizer throughput on the sample CVs.
+
+The NLTK side needs the tokenizer data (``python nltk_resources.py``) and is
+skipped without it. That both produce the same tokens is tested in
+tests/test_tokenizer.py.
+
+    python benchmarks/bench_tokenizer.py [-n 200]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import nltk_resources
+from samples import sample_corpus
+from tokenizer import NltkTokenizer, RegexTokenizer
+
+
+def throughput(label, tok, corpus, runs):
+    size = sum(len(text) for text in corpus) * runs
+    start = time.perf_counter()
+    for _ in range(runs):
+        for text in corpus:
+            tok.tokenize(text)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<8} {size / elapsed / 1e6:8.2f} MB/s   {elapsed / (runs * len(corpus)) * 1000:8.3f} ms/doc")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    corpus = sample_corpus()
+    regex = RegexTokenizer()
+    throughput("regex", regex, corpus, args.runs)
+
+    if nltk_resources.missing_resources():
+        print("NLTK data not found, skipping the NLTK tokenizer (run `python nltk_resources.py`).")
+        return
+
+    nltk_tok = NltkTokenizer()
+    nltk_tok.tokenize("warm up")
+    throughput("nltk", nltk_tok, corpus, args.runs)
+
+
+if __name__ == "__main__":
+    main()
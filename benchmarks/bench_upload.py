@@ -0,0 +1,65 @@
+"""Peak memory of reading an upload: plain UploadFile.read() vs uploads.read_upload.
+
+Each case spools a file to disk the way Starlette does and reports the peak
+Python allocation (tracemalloc) while the handler reads it.
+
+    python benchmarks/bench_upload.py [--size-mb 100] [--limit-mb 12]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from starlette.datastructures import UploadFile
+
+import uploads
+
+
+def spooled_upload(payload_size, prefix):
+    spool = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    spool.write(prefix)
+    block = b"x" * (1024 * 1024)
+    remaining = payload_size - len(prefix)
+    while remaining > 0:
+        spool.write(block[:remaining])
+        remaining -= len(block)
+    spool.seek(0)
+    return UploadFile(spool, filename="cv.docx")
+
+
+async def peak(label, read, payload_size, prefix):
+    upload = spooled_upload(payload_size, prefix)
+    tracemalloc.start()
+    try:
+        outcome = f"{len(await read(upload))} bytes"
+    except ValueError as e:
+        outcome = str(e)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    upload.file.close()
+    print(f"{label:<40} peak {peak_bytes / 1024 / 1024:8.2f} MB   {outcome}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=100, help="Size of the oversized upload")
+    parser.add_argument("--limit-mb", type=int, default=12)
+    args = parser.parse_args()
+
+    size = args.size_mb * 1024 * 1024
+    limit = args.limit_mb * 1024 * 1024
+    bounded = lambda upload: uploads.read_upload(upload, limit)
+
+    await peak("oversized, UploadFile.read()", lambda upload: upload.read(), size, uploads.ZIP_MAGIC)
+    await peak("oversized, read_upload", bounded, size, uploads.ZIP_MAGIC)
+    await peak("not a ZIP, UploadFile.read()", lambda upload: upload.read(), size, b"MZ")
+    await peak("not a ZIP, read_upload", bounded, size, b"MZ")
+    await peak("1MB DOCX-sized, read_upload", bounded, 1024 * 1024, uploads.ZIP_MAGIC)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
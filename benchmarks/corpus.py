@@ -0,0 +1,114 @@
+"""Synthetic CV profiles of controlled size, for benchmarks and load tests.
+
+Profiles are deterministic for a given seed. ``profile()`` follows the schema of
+cv_data.example.json (the default template); ``flat_profile()`` converts one to
+the simpler schema used by templates/template_*.py (skills as strings, job
+descriptions as one paragraph).
+
+    python benchmarks/corpus.py out/ --sizes 2 10 50 200 [--bullets 8] [--jsonl]
+"""
+import argparse
+import json
+import os
+import random
+
+DEFAULT_SIZES = (2, 10, 50, 200)
+
+FIRST_NAMES = ["Alex", "Priya", "Jordan", "Mei", "Tomasz", "Amara", "Luis", "Sofia", "Kwame", "Hannah"]
+LAST_NAMES = ["Morgan", "Patel", "Nguyen", "Kowalski", "Okafor", "Garcia", "Rossi", "Mensah", "Schmidt", "Tanaka"]
+TITLES = ["Software Engineer", "Senior Developer", "Data Engineer", "Engineering Manager", "DevOps Engineer",
+          "Frontend Developer", "Backend Developer", "Technical Lead", "QA Engineer", "Site Reliability Engineer"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Ltd", "Hooli", "Stark Industries", "Wayne Enterprises",
+             "Vandelay Imports", "Soylent", "Cyberdyne Systems"]
+SKILLS = {
+    "Languages": ["Python", "JavaScript", "TypeScript", "Go", "Java", "SQL", "Rust", "Kotlin"],
+    "Frameworks": ["Django", "FastAPI", "React", "Vue.js", "Spring", "Node.js", "Flask"],
+    "Tools": ["Docker", "Kubernetes", "Terraform", "Git", "Jenkins", "AWS", "PostgreSQL", "Redis"],
+}
+VERBS = ["Built", "Designed", "Led", "Migrated", "Automated", "Reduced", "Improved", "Delivered", "Mentored",
+         "Introduced", "Scaled", "Refactored"]
+WORDS = ["customer", "platform", "pipeline", "latency", "service", "deployment", "reporting", "dashboard", "team",
+         "release", "testing", "database", "integration", "monitoring", "onboarding", "infrastructure", "payments",
+         "search", "analytics", "security", "availability", "throughput", "costs", "workflow", "quality", "users",
+         "microservices", "backend", "frontend", "CI/CD", "GraphQL", "by", "across", "for", "with", "the", "and",
+         "while", "every", "new"]
+
+
+def _sentence(rng, words):
+    text = f"{rng.choice(VERBS)} " + " ".join(rng.choice(WORDS) for _ in range(words - 1))
+    return text + f", improving results by {rng.randint(5, 90)}%."
+
+
+def profile(jobs, bullets=8, words_per_bullet=18, seed=0):
+    """Returns a CV in the default template's schema with the given number of jobs."""
+    rng = random.Random(f"{seed}:{jobs}:{bullets}:{words_per_bullet}")
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    experience = []
+    for i in range(jobs):
+        start = 2024 - 2 * (i + 1)
+        experience.append({
+            "title": rng.choice(TITLES),
+            "company": rng.choice(COMPANIES),
+            "dates": f"{start} - {start + 2}",
+            "description": {
+                "intro": _sentence(rng, words_per_bullet),
+                "details": [_sentence(rng, words_per_bullet) for _ in range(bullets)],
+            },
+            "accomplishments": [_sentence(rng, words_per_bullet) for _ in range(max(1, bullets // 3))],
+        })
+
+    return {
+        "name": f"{first} {last}",
+        "phone": f"+1-555-{rng.randint(1000, 9999)}",
+        "email": f"{first}.{last}@example.com".lower(),
+        "contact": "Remote",
+        "summary": " ".join(_sentence(rng, words_per_bullet) for _ in range(3)),
+        "skills": [{"category": category, "items": rng.sample(items, 5)} for category, items in SKILLS.items()],
+        "strengths_and_expertise": [_sentence(rng, 8) for _ in range(6)],
+        "experience": experience,
+        "education": [{"degree": "B.Sc. Computer Science", "institution": "State University", "year": "2008"}],
+    }
+
+
+def flat_profile(data):
+    """Converts a profile() to the schema of templates/template_*.py."""
+    flat = dict(data)
+    flat["location"] = data["contact"]
+    flat["skills"] = [item for category in data["skills"] for item in category["items"]]
+    flat["experience"] = [
+        dict(job, description=" ".join([job["description"]["intro"]] + job["description"]["details"]))
+        for job in data["experience"]
+    ]
+    return flat
+
+
+def profile_for(template_id, jobs, **kwargs):
+    data = profile(jobs, **kwargs)
+    return data if template_id == "default" else flat_profile(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output_dir")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Job counts")
+    parser.add_argument("--bullets", type=int, default=8, help="Bullet points per job")
+    parser.add_argument("--count", type=int, default=1, help="Profiles per size (different seeds)")
+    parser.add_argument("--jsonl", action="store_true", help="Write one corpus.jsonl instead of one file per profile")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    profiles = [(f"jobs{jobs:03d}_{seed}", profile(jobs, args.bullets, seed=seed))
+                for jobs in args.sizes for seed in range(args.count)]
+    if args.jsonl:
+        with open(os.path.join(args.output_dir, "corpus.jsonl"), "w", encoding="utf-8") as f:
+            for _, data in profiles:
+                f.write(json.dumps(data) + "\n")
+    else:
+        for label, data in profiles:
+            with open(os.path.join(args.output_dir, label + ".json"), "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+    print(f"Wrote {len(profiles)} profiles to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Checks that importing a module stays within its time budget.
+
+Each run imports the module in a fresh interpreter under ``python -X importtime``
+and the median cumulative import time is compared against the budget. Exits
+non-zero when any module is over budget; without a module argument every module
+in BUDGETS_MS is checked. tests/test_imports.py enforces the same budgets in CI
+(with some slack for slower machines) and checks that imports stay offline and
+leave the heavy dependencies for first use.
+
+    python benchmarks/import_budget.py [module] [--budget-ms N] [-n RUNS]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Median cumulative import time allowed per module, in milliseconds
+BUDGETS_MS = {
+    "ats_analysis": 500,
+    # Most of it is FastAPI itself (~350ms); this is what a new worker pays before it can serve
+    "api": 600,
+}
+
+def import_time_ms(module):
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    for line in reversed(proc.stderr.splitlines()):
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if name.strip() == module and not name.startswith("  "):
+            return int(cumulative) / 1000
+    raise SystemExit(f"No import time reported for {module}")
+
+
+def check(module, budget, runs):
+    timings = [import_time_ms(module) for _ in range(runs)]
+    median = statistics.median(timings)
+    status = "OK" if median <= budget else "OVER BUDGET"
+    print(f"import {module}: median {median:.0f} ms over {runs} runs (budget {budget:.0f} ms) {status}")
+    return median <= budget
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("module", nargs="?", help="Module to check (default: every module with a budget)")
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("-n", "--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.module is None:
+        results = [check(module, budget, args.runs) for module, budget in BUDGETS_MS.items()]
+        sys.exit(0 if all(results) else 1)
+
+    budget = args.budget_ms if args.budget_ms is not None else BUDGETS_MS.get(args.module)
+    if budget is None:
+        raise SystemExit(f"No budget defined for {args.module}; pass --budget-ms")
+    sys.exit(0 if check(args.module, budget, args.runs) else 1)
+
+
+if __name__ == "__main__":
+    main()
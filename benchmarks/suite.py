@@ -0,0 +1,191 @@
+"""Benchmark suite: CV generation per template and engine, ATS analysis, and the API end to end.
+
+Profiles come from corpus.py, from 2 jobs up to 200 jobs with long bullet lists.
+The API is driven in-process through httpx's ASGI transport, with the result
+caches turned off so every request does the full work. Results are written as
+JSON; pass an earlier result file as --baseline to fail (exit 1) when any median
+got slower by more than --threshold.
+
+    python benchmarks/suite.py -o results.json [--baseline baseline.json] [--threshold 0.2]
+                               [--sizes 2 10 50 200] [-n 5] [--workers 0]
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import DEFAULT_SIZES, profile_for
+from samples import ROOT, time_calls
+
+
+def summarize(timings):
+    timings = sorted(timings)
+    return {
+        "runs": len(timings),
+        "median_ms": round(timings[len(timings) // 2] * 1000, 3),
+        "min_ms": round(timings[0] * 1000, 3),
+        "max_ms": round(timings[-1] * 1000, 3),
+    }
+
+
+# One untimed warm-up call, then `runs` timed ones
+def measure(fn, runs):
+    fn()
+    return summarize(time_calls(fn, runs))
+
+
+async def measure_async(fn, runs):
+    await fn()
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await fn()
+        timings.append(time.perf_counter() - start)
+    return summarize(timings)
+
+
+def report(results, name, result):
+    results[name] = result
+    if "error" in result:
+        print(f"{name:<40} ERROR {result['error']}")
+    else:
+        print(f"{name:<40} median {result['median_ms']:9.2f} ms   min {result['min_ms']:9.2f} ms")
+
+
+def bench_generation(results, sizes, runs):
+    import template_registry
+
+    for template_id in template_registry.available_templates():
+        for engine, supported in template_registry.ENGINES.items():
+            if supported is not None and template_id not in supported:
+                continue
+            for jobs in sizes:
+                data = profile_for(template_id, jobs)
+                name = f"generate/{template_id}/{engine}/jobs={jobs}"
+                try:
+                    result = measure(lambda: template_registry.render(data, template_id, engine), runs)
+                except Exception as e:
+                    result = {"error": f"{type(e).__name__}: {e}"}
+                report(results, name, result)
+
+
+def bench_analysis(results, sizes, runs):
+    import json_to_cv
+    from ats_analysis import analyze_cv_api
+
+    for jobs in sizes:
+        contents = json_to_cv.render(profile_for("default", jobs))
+        report(results, f"analyze/jobs={jobs}", measure(lambda: analyze_cv_api(contents, "cv.docx"), runs))
+
+
+async def bench_api(results, sizes, runs):
+    import httpx
+
+    import api
+
+    transport = httpx.ASGITransport(app=api.app)
+    async with api.lifespan(api.app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for jobs in sizes:
+                json_text = json.dumps(profile_for("default", jobs))
+
+                async def generate():
+                    response = await client.post("/", data={"json_text": json_text})
+                    response.raise_for_status()
+                    return response.content
+
+                contents = await generate()
+
+                async def ats_check():
+                    files = {"cv_file": ("cv.docx", contents, api.DOCX_MEDIA_TYPE)}
+                    response = await client.post("/ats-check", files=files)
+                    response.raise_for_status()
+
+                report(results, f"api/generate/jobs={jobs}", await measure_async(generate, runs))
+                report(results, f"api/ats-check/jobs={jobs}", await measure_async(ats_check, runs))
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# Returns the names whose median grew by more than threshold (a fraction) over the baseline
+def compare(results, baseline, threshold):
+    regressions = []
+    print(f"\n{'benchmark':<40} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before or "median_ms" not in before or "median_ms" not in result:
+            continue
+        change = result["median_ms"] / before["median_ms"] - 1 if before["median_ms"] else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<40} {before['median_ms']:10.2f} {result['median_ms']:10.2f} {change:+8.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Earlier results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown of a median (0.2 = 20%%)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Job counts to profile")
+    parser.add_argument("-n", "--runs", type=int, default=5)
+    parser.add_argument("--workers", default="0", help="CV_WORKERS for the API run (0 = threads, no subprocesses)")
+    parser.add_argument("--only", choices=["generate", "analyze", "api"], nargs="+",
+                        default=["generate", "analyze", "api"])
+    args = parser.parse_args()
+
+    # The API must do the full work on every request
+    os.environ["CV_CACHE_ENABLED"] = "0"
+    os.environ["CV_ATS_CACHE_SIZE"] = "0"
+    os.environ["CV_WORKERS"] = args.workers
+    os.chdir(ROOT)  # api.py loads html/ relative to the working directory
+
+    results = {}
+    if "generate" in args.only:
+        bench_generation(results, args.sizes, args.runs)
+    if "analyze" in args.only:
+        bench_analysis(results, args.sizes, args.runs)
+    if "api" in args.only:
+        asyncio.run(bench_api(results, args.sizes, args.runs))
+
+    if args.output:
+        meta = {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "runs": args.runs,
+            "sizes": args.sizes,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+            sys.exit(1)
+        print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
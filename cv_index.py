@@ -0,0 +1,383 @@
+"""Persistent inverted index of CVs for ranking large applicant pools against job descriptions.
+
+CVs are reduced once, when added, to the same normalized terms keyword_match uses
+(DOCX text comes from the ATS snapshot, as in ``ats_analysis.read_docx``), and
+stored in SQLite:
+
+- ``documents``: one row per CV (stable ID, label, content digest, term count,
+  deleted flag)
+- ``terms``: term -> id
+- ``postings``: for each term, packed NumPy arrays of document ids and term
+  frequencies, one row per segment
+
+Each ``add_many`` call writes one new segment, so adding CVs never rewrites
+existing postings. Each CV gets a server-generated ID; ``replace`` and
+``remove`` take that ID, so CVs that share a label (two uploads named
+resume.docx) or a text are separate entries. Once there are more than ``MAX_SEGMENTS`` segments they are
+merged into one, which also drops removed CVs.
+
+Ranking uses Okapi BM25, which, unlike TF-IDF cosine, needs no per-document
+norm that would go stale as the corpus grows. A query reads only the postings
+of the job description's terms and scores them with vectorized NumPy, so it
+never touches a DOCX and stays well under a second over 100k CVs (see
+``benchmarks/bench_cv_index.py``).
+
+    python cv_index.py add cvs/*.docx profiles.jsonl [--index cv_index.db]
+    python cv_index.py rank job.txt [--top 20]
+"""
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import defaultdict, namedtuple
+
+import numpy as np
+
+from keyword_match import DEFAULT_MAX_KEYWORDS, profile_text, term_counts
+
+DEFAULT_INDEX_PATH = "cv_index.db"
+MAX_SEGMENTS = 16
+# BM25 parameters (the usual defaults)
+K1 = 1.2
+B = 0.75
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    cv_id TEXT UNIQUE,
+    label TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    deleted INTEGER NOT NULL DEFAULT 0,
+    added_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documents_label_digest ON documents (label, digest);
+CREATE TABLE IF NOT EXISTS terms (id INTEGER PRIMARY KEY, term TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS postings (
+    term_id INTEGER NOT NULL,
+    segment INTEGER NOT NULL,
+    doc_ids BLOB NOT NULL,
+    tfs BLOB NOT NULL,
+    PRIMARY KEY (term_id, segment)
+) WITHOUT ROWID;
+"""
+
+Candidate = namedtuple("Candidate", ["id", "label", "score", "coverage", "matched", "missing"])
+
+
+def digest_text(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class CVIndex:
+    """An index file; safe to share between threads of one process."""
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._lock = threading.Lock()
+        self._version = None
+        self._lengths = np.zeros(0)
+        self._live = np.zeros(0, dtype=bool)
+
+    @classmethod
+    def from_env(cls):
+        return cls(os.getenv("CV_INDEX_PATH", DEFAULT_INDEX_PATH))
+
+    def close(self):
+        self._db.close()
+
+    def _meta(self, key):
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    def _bump(self, key):
+        self._db.execute("INSERT INTO meta (key, value) VALUES (?, 1) "
+                         "ON CONFLICT (key) DO UPDATE SET value = value + 1", (key,))
+        return self._meta(key)
+
+    def add_many(self, items):
+        """Adds (label, text) pairs; returns the ID of each CV, in order.
+
+        Every pair becomes its own entry, except that adding the same text under the
+        same label again returns the existing ID.
+        """
+        return self._write([(None, label, text) for label, text in items])
+
+    def add(self, label, text):
+        return self.add_many([(label, text)])[0]
+
+    def replace(self, cv_id, label, text):
+        """Replaces the CV with the given ID, keeping the ID; returns False for an unknown ID."""
+        return self._write([(cv_id, label, text)])[0] is not None
+
+    # (cv_id or None, label, text) triples; a given cv_id replaces that entry (None if it is unknown), None adds one
+    def _write(self, entries):
+        ids = []
+        seen = {}
+        postings = defaultdict(lambda: ([], []))
+        now = time.time()
+        with self._lock, self._db:
+            for cv_id, label, text in entries:
+                digest = digest_text(text)
+                if cv_id is None:
+                    if (label, digest) in seen:
+                        ids.append(seen[label, digest])
+                        continue
+                    row = self._db.execute("SELECT cv_id FROM documents WHERE label = ? AND digest = ? AND deleted = 0",
+                                           (label, digest)).fetchone()
+                    if row:
+                        ids.append(row[0])
+                        continue
+                    cv_id = uuid.uuid4().hex
+                # The old row keeps its postings until optimize() but no longer holds the ID
+                elif not self._db.execute("UPDATE documents SET cv_id = NULL, deleted = 1 WHERE cv_id = ?",
+                                          (cv_id,)).rowcount:
+                    ids.append(None)
+                    continue
+                seen[label, digest] = cv_id
+                ids.append(cv_id)
+                counts = term_counts(text)
+                doc_id = self._db.execute(
+                    "INSERT INTO documents (cv_id, label, digest, length, added_at) VALUES (?, ?, ?, ?, ?)",
+                    (cv_id, label, digest, sum(counts.values()), now)).lastrowid
+                for term, count in counts.items():
+                    doc_ids, tfs = postings[term]
+                    doc_ids.append(doc_id)
+                    tfs.append(count)
+
+            if postings:
+                self._db.executemany("INSERT OR IGNORE INTO terms (term) VALUES (?)", ((term,) for term in postings))
+                term_ids = self._term_ids(list(postings))
+                segment = self._bump("segment")
+                self._db.executemany(
+                    "INSERT INTO postings (term_id, segment, doc_ids, tfs) VALUES (?, ?, ?, ?)",
+                    ((term_ids[term], segment, np.asarray(doc_ids, dtype=np.int32).tobytes(),
+                      np.asarray(tfs, dtype=np.int32).tobytes())
+                     for term, (doc_ids, tfs) in postings.items()))
+            self._bump("version")
+
+        if self.segment_count() > MAX_SEGMENTS:
+            self.optimize()
+        return ids
+
+    def remove(self, cv_id):
+        with self._lock, self._db:
+            removed = self._db.execute("UPDATE documents SET cv_id = NULL, deleted = 1 WHERE cv_id = ?", (cv_id,)).rowcount
+            self._bump("version")
+        return removed > 0
+
+    def segment_count(self):
+        return self._db.execute("SELECT COUNT(DISTINCT segment) FROM postings").fetchone()[0]
+
+    def optimize(self):
+        """Merges all segments into one and drops the postings of removed CVs.
+
+        Works one term at a time, so memory stays bounded by the longest postings list.
+        """
+        with self._lock, self._db:
+            live = self._load_documents()[1]
+            segment = self._bump("segment")
+            term_ids = [row[0] for row in self._db.execute("SELECT DISTINCT term_id FROM postings")]
+            for term_id in term_ids:
+                doc_ids, tfs = self._postings(term_id)
+                keep = live[doc_ids]
+                self._db.execute("DELETE FROM postings WHERE term_id = ?", (term_id,))
+                if keep.any():
+                    self._db.execute("INSERT INTO postings (term_id, segment, doc_ids, tfs) VALUES (?, ?, ?, ?)",
+                                     (term_id, segment, doc_ids[keep].tobytes(), tfs[keep].tobytes()))
+            self._db.execute("DELETE FROM documents WHERE deleted = 1")
+            self._bump("version")
+
+    # All segments of a term's postings as (doc_ids, tfs) arrays, or (None, None)
+    def _postings(self, term_id):
+        rows = self._db.execute("SELECT doc_ids, tfs FROM postings WHERE term_id = ?", (term_id,)).fetchall()
+        if not rows:
+            return None, None
+        doc_ids = np.concatenate([np.frombuffer(row[0], dtype=np.int32) for row in rows])
+        tfs = np.concatenate([np.frombuffer(row[1], dtype=np.int32) for row in rows])
+        return doc_ids, tfs
+
+    def _term_ids(self, terms):
+        ids = {}
+        # SQLite limits the number of bound parameters per statement
+        for start in range(0, len(terms), 500):
+            chunk = terms[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            ids.update(self._db.execute(f"SELECT term, id FROM terms WHERE term IN ({placeholders})", chunk))
+        return ids
+
+    # Document lengths and the live mask, indexed by document id; reloaded only when the index changed
+    def _load_documents(self):
+        version = self._meta("version")
+        if version != self._version:
+            rows = self._db.execute("SELECT id, length, deleted FROM documents").fetchall()
+            size = max((row[0] for row in rows), default=0) + 1
+            lengths = np.zeros(size)
+            live = np.zeros(size, dtype=bool)
+            if rows:
+                table = np.asarray(rows, dtype=np.int64)
+                lengths[table[:, 0]] = table[:, 1]
+                live[table[:, 0]] = table[:, 2] == 0
+            self._lengths, self._live, self._version = lengths, live, version
+        return self._lengths, self._live
+
+    def stats(self):
+        with self._lock:
+            lengths, live = self._load_documents()
+            return {
+                "documents": int(live.sum()),
+                "terms": self._db.execute("SELECT COUNT(*) FROM terms").fetchone()[0],
+                "segments": self.segment_count(),
+                "path": self.path,
+            }
+
+    def rank(self, job_description, top=20, max_keywords=DEFAULT_MAX_KEYWORDS):
+        """Returns the top CVs for a job description by BM25, with matched and missing keywords."""
+        query = term_counts(job_description)
+        if not query:
+            raise ValueError("The job description has no keywords.")
+
+        with self._lock:
+            # One read transaction: another process's add_many must not land between reading
+            # the documents and their postings, or the postings would name unknown documents
+            self._db.execute("BEGIN")
+            try:
+                lengths, live = self._load_documents()
+                documents = int(live.sum())
+                if not documents:
+                    return []
+                average_length = lengths[live].mean() or 1.0
+                term_ids = self._term_ids(list(query))
+                postings = {}
+                for term, term_id in term_ids.items():
+                    doc_ids, tfs = self._postings(term_id)
+                    if doc_ids is None:
+                        continue
+                    keep = live[doc_ids]
+                    postings[term] = (doc_ids[keep], tfs[keep].astype(np.float64))
+            finally:
+                self._db.commit()
+
+        scores = np.zeros(len(lengths))
+        weights = {}
+        norm = K1 * (1 - B + B * lengths / average_length)
+        for term, count in query.items():
+            doc_ids, tfs = postings.get(term, (None, None))
+            df = 0 if doc_ids is None else len(doc_ids)
+            idf = math.log(1 + (documents - df + 0.5) / (df + 0.5))
+            weights[term] = idf * (1 + math.log(count))
+            if df:
+                scores[doc_ids] += weights[term] * tfs * (K1 + 1) / (tfs + norm[doc_ids])
+
+        candidates = np.flatnonzero(scores > 0)
+        best = candidates[np.argsort(-scores[candidates], kind="stable")[:top]]
+
+        keywords = sorted(weights, key=weights.get, reverse=True)[:max_keywords]
+        present = {term: np.isin(best, postings[term][0]) if term in postings else np.zeros(len(best), dtype=bool)
+                   for term in keywords}
+        entries = self._entries(best.tolist())
+        results = []
+        for row, doc_id in enumerate(best.tolist()):
+            matched = [term for term in keywords if present[term][row]]
+            cv_id, label = entries.get(doc_id, (None, None))
+            results.append(Candidate(cv_id, label, round(float(scores[doc_id]), 4),
+                                     round(len(matched) / len(keywords), 4), matched,
+                                     [term for term in keywords if not present[term][row]]))
+        return results
+
+    # Document id -> (cv_id, label)
+    def _entries(self, doc_ids):
+        if not doc_ids:
+            return {}
+        with self._lock:
+            placeholders = ",".join("?" * len(doc_ids))
+            rows = self._db.execute(f"SELECT id, cv_id, label FROM documents WHERE id IN ({placeholders})", doc_ids)
+            return {row[0]: (row[1], row[2]) for row in rows}
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+# The index at CV_INDEX_PATH, opened on first use
+def get_index():
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = CVIndex.from_env()
+    return _index
+
+
+# Worker-pool helper for the API: DOCX bytes -> (label, text), parsed the way read_docx does
+def extract_texts(documents):
+    from document_snapshot import DocumentSnapshot, InvalidDocumentError
+    texts = []
+    for filename, contents in documents:
+        try:
+            texts.append((filename, DocumentSnapshot.from_bytes(contents, filename).text))
+        except InvalidDocumentError as e:
+            raise InvalidDocumentError(f"{filename}: {e}")
+    return texts
+
+
+# (label, text) pairs for the CLI: .docx via read_docx, .json profiles, .jsonl one profile per line
+def read_sources(paths):
+    for path in paths:
+        lower = path.lower()
+        if lower.endswith(".jsonl"):
+            with open(path, "r", encoding="utf-8") as f:
+                for lineno, line in enumerate(f, 1):
+                    if line.strip():
+                        yield f"{os.path.basename(path)}:{lineno}", profile_text(json.loads(line))
+        elif lower.endswith(".json"):
+            with open(path, "r", encoding="utf-8") as f:
+                yield os.path.basename(path), profile_text(json.load(f))
+        else:
+            from ats_analysis import read_docx
+            yield os.path.basename(path), read_docx(path)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Maintain and query the CV inverted index.")
+    parser.add_argument("--index", default=os.getenv("CV_INDEX_PATH", DEFAULT_INDEX_PATH))
+    commands = parser.add_subparsers(dest="command", required=True)
+    add_parser = commands.add_parser("add", help="Index .docx files, .json profiles or .jsonl files of profiles")
+    add_parser.add_argument("paths", nargs="+")
+    rank_parser = commands.add_parser("rank", help="Rank indexed CVs against a job description file")
+    rank_parser.add_argument("job_description")
+    rank_parser.add_argument("--top", type=int, default=20)
+    commands.add_parser("optimize", help="Merge segments and drop removed CVs")
+    commands.add_parser("stats")
+    args = parser.parse_args()
+
+    index = CVIndex(args.index)
+    if args.command == "add":
+        start = time.perf_counter()
+        added = index.add_many(read_sources(args.paths))
+        print(f"Indexed {len(added)} CVs in {time.perf_counter() - start:.2f}s")
+    elif args.command == "rank":
+        with open(args.job_description, "r", encoding="utf-8") as f:
+            job_description = f.read()
+        start = time.perf_counter()
+        candidates = index.rank(job_description, args.top)
+        for candidate in candidates:
+            print(f"{candidate.score:8.3f}  {candidate.coverage:5.0%}  {candidate.label}  ({candidate.id})")
+            if candidate.missing:
+                print(f"          missing: {', '.join(candidate.missing)}")
+        print(f"Ranked in {(time.perf_counter() - start) * 1000:.1f} ms")
+    elif args.command == "optimize":
+        index.optimize()
+        print(index.stats())
+    else:
+        print(index.stats())
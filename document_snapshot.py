@@ -0,0 +1,73 @@
+import datetime
+import os
+import zipfile
+from dataclasses import dataclass, field
+from functools import cached_property
+from io import BytesIO
+
+import tokenizer
+from docx_stream import InvalidDocumentError, iter_document
+
+
+# Real CVs are a few MB unpacked at most; anything bigger is refused before it is decompressed
+MAX_UNCOMPRESSED_SIZE = 64 * 1024 * 1024
+MAX_ARCHIVE_ENTRIES = 1000
+
+
+def check_archive(source):
+    """Raises InvalidDocumentError for a ZIP (bytes or a path) that would unpack to too much data (a zip bomb).
+
+    Only the central directory is read. zipfile never inflates an entry past the size it
+    declares there, so bounding the declared sizes bounds what parsing can allocate.
+    """
+    try:
+        with zipfile.ZipFile(BytesIO(source) if isinstance(source, (bytes, bytearray)) else source) as archive:
+            entries = archive.infolist()
+    except (zipfile.BadZipFile, zipfile.LargeZipFile, ValueError) as e:
+        raise InvalidDocumentError(str(e)) from e
+    if len(entries) > MAX_ARCHIVE_ENTRIES:
+        raise InvalidDocumentError(f"Archive has too many entries ({len(entries)})")
+    total = sum(info.file_size for info in entries)
+    if total > MAX_UNCOMPRESSED_SIZE:
+        raise InvalidDocumentError(f"Archive unpacks to {total} bytes, more than the {MAX_UNCOMPRESSED_SIZE} allowed")
+
+
+@dataclass
+class DocumentSnapshot:
+    """Everything the ATS checks need from a CV, read from the DOCX in a single pass."""
+
+    filename: str
+    size: int
+    last_modified: datetime.datetime
+    paragraphs: list = field(default_factory=list)
+    runs: list = field(default_factory=list)
+
+    @cached_property
+    def text(self):
+        return '\n'.join(self.paragraphs)
+
+    # Tokenized once and shared by the word count and spelling checks
+    @cached_property
+    def tokens(self):
+        return tokenizer.tokenize(self.text)
+
+    @classmethod
+    def read(cls, source, filename, size, last_modified):
+        """Streams the paragraphs and run fonts out of a DOCX given as bytes or a path (see docx_stream)."""
+        check_archive(source)
+        paragraphs, runs = [], []
+        for paragraph in iter_document(source):
+            paragraphs.append(paragraph.text)
+            runs.extend(paragraph.runs)
+        return cls(filename=filename, size=size, last_modified=last_modified, paragraphs=paragraphs, runs=runs)
+
+    @classmethod
+    def from_bytes(cls, data, filename, last_modified=None):
+        """Parses an uploaded DOCX. Uploads have no file mtime, so they count as modified now."""
+        return cls.read(data, filename, len(data), last_modified or datetime.datetime.now())
+
+    # Read straight from disk: embedded images and other parts are never loaded
+    @classmethod
+    def from_path(cls, file_path):
+        last_modified = datetime.datetime.fromtimestamp(os.path.getmtime(file_path))
+        return cls.read(file_path, os.path.basename(file_path), os.path.getsize(file_path), last_modified)
@@ -0,0 +1,226 @@
+"""Streams the paragraphs and run fonts of a DOCX without building a python-docx object tree.
+
+``word/document.xml`` is inflated and parsed incrementally (``ElementTree.iterparse``)
+straight from the archive. Each body paragraph becomes a ``Paragraph`` and is then
+dropped from the tree, so memory is bounded by the largest paragraph rather than the
+document; images and other parts are never read. What comes out matches python-docx:
+body-level paragraphs only (not table cells), hyperlink text included, tabs and line
+breaks as ``\\t`` and ``\\n``, and each run's directly applied font name, size and color.
+
+``word/styles.xml`` is read the same way when ``resolve_styles=True``: a run's missing
+font attributes are then filled in from its character style, its paragraph's style and
+the document defaults, following ``basedOn`` chains.
+
+    for paragraph in iter_document("cv.docx"):
+        print(paragraph.style, paragraph.text, paragraph.runs)
+"""
+import posixpath
+import zipfile
+from collections import namedtuple
+from io import BytesIO
+from xml.etree import ElementTree
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_RELATIONSHIPS = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+_OFFICE_DOCUMENT = "/officeDocument"
+_STYLES = "/styles"
+
+DOCUMENT_PART = "word/document.xml"
+STYLES_PART = "word/styles.xml"
+
+# Font attributes of a single run; any of them may be None when inherited from the style
+RunFont = namedtuple("RunFont", ["name", "size", "color"])
+Paragraph = namedtuple("Paragraph", ["text", "style", "runs"])
+
+_NO_FONT = RunFont(None, None, None)
+
+# Run children that python-docx turns into text, other than w:t and w:br
+_RUN_TEXT = {W + "tab": "\t", W + "ptab": "\t", W + "cr": "\n", W + "noBreakHyphen": "-"}
+
+
+class InvalidDocumentError(ValueError):
+    """Raised when the given bytes cannot be opened as a DOCX document."""
+
+
+def open_archive(source):
+    """ZipFile over DOCX bytes, a path or a binary file object."""
+    try:
+        return zipfile.ZipFile(BytesIO(source) if isinstance(source, (bytes, bytearray)) else source)
+    except (zipfile.BadZipFile, zipfile.LargeZipFile, ValueError) as e:
+        raise InvalidDocumentError(str(e)) from e
+
+
+# Target of the first relationship of the given type in a .rels part, as an archive path
+def _related_part(archive, rels_part, relationship_type):
+    try:
+        rels = ElementTree.fromstring(archive.read(rels_part))
+    except KeyError:
+        return None
+    base = posixpath.dirname(posixpath.dirname(rels_part))
+    for rel in rels.iter(_RELATIONSHIPS):
+        if rel.get("Type", "").endswith(relationship_type) and rel.get("TargetMode") != "External":
+            return posixpath.normpath(posixpath.join(base, rel.get("Target", ""))).lstrip("/")
+    return None
+
+
+def part_names(archive):
+    """(main document part, styles part or None), found through the package relationships."""
+    document = _related_part(archive, "_rels/.rels", _OFFICE_DOCUMENT) or DOCUMENT_PART
+    folder, name = posixpath.split(document)
+    styles = _related_part(archive, posixpath.join(folder, "_rels", name + ".rels"), _STYLES)
+    if styles is None and STYLES_PART in archive.namelist():
+        styles = STYLES_PART
+    return document, styles
+
+
+def _run_font(rpr):
+    if rpr is None:
+        return _NO_FONT
+    fonts = rpr.find(W + "rFonts")
+    size = rpr.find(W + "sz")
+    color = rpr.find(W + "color")
+    size = size.get(W + "val") if size is not None else None
+    color = color.get(W + "val") if color is not None else None
+    return RunFont(
+        fonts.get(W + "ascii") if fonts is not None else None,
+        int(size) / 2 if size and size.isdigit() else None,
+        color.upper() if color and color != "auto" else None,
+    )
+
+
+def _run_text(run):
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag == W + "t":
+            parts.append(child.text or "")
+        elif tag == W + "br":
+            parts.append("\n" if child.get(W + "type", "textWrapping") == "textWrapping" else "")
+        elif tag in _RUN_TEXT:
+            parts.append(_RUN_TEXT[tag])
+    return "".join(parts)
+
+
+def _style_id(properties, tag):
+    style = properties.find(tag) if properties is not None else None
+    return style.get(W + "val") if style is not None else None
+
+
+# Same text and runs as python-docx's Paragraph.text and Paragraph.runs
+def _paragraph(p, styles):
+    text, runs = [], []
+    style = _style_id(p.find(W + "pPr"), W + "pStyle")
+    for child in p:
+        if child.tag == W + "r":
+            text.append(_run_text(child))
+            rpr = child.find(W + "rPr")
+            font = _run_font(rpr)
+            if styles is not None:
+                font = styles.resolve(font, style, _style_id(rpr, W + "rStyle"))
+            runs.append(font)
+        elif child.tag == W + "hyperlink":
+            text.extend(_run_text(run) for run in child.iterfind(W + "r"))
+    return Paragraph("".join(text), style, runs)
+
+
+def _merge(font, fallback):
+    if fallback is None:
+        return font
+    return RunFont(*(value if value is not None else default for value, default in zip(font, fallback)))
+
+
+class Styles:
+    """Run fonts of the styles in styles.xml, for filling in what a run inherits."""
+
+    def __init__(self, fonts, based_on, defaults=None, default_paragraph_style=None):
+        self.fonts = fonts
+        self.based_on = based_on
+        self.defaults = defaults
+        self.default_paragraph_style = default_paragraph_style
+        self._resolved = {}
+
+    # A style's font merged with the styles it is based on
+    def font(self, style_id):
+        if style_id in self._resolved:
+            return self._resolved[style_id]
+        font, seen, current = _NO_FONT, set(), style_id
+        while current in self.fonts and current not in seen:
+            seen.add(current)
+            font = _merge(font, self.fonts[current])
+            current = self.based_on.get(current)
+        self._resolved[style_id] = font
+        return font
+
+    def resolve(self, font, paragraph_style=None, run_style=None):
+        if run_style:
+            font = _merge(font, self.font(run_style))
+        font = _merge(font, self.font(paragraph_style or self.default_paragraph_style))
+        return _merge(font, self.defaults)
+
+
+def read_styles(archive, part=STYLES_PART):
+    """Styles from a styles part, parsed one w:style element at a time."""
+    fonts, based_on = {}, {}
+    defaults = default_paragraph_style = None
+    root, depth = None, 0
+    with archive.open(part) as xml:
+        for event, element in ElementTree.iterparse(xml, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                root = root if root is not None else element
+                continue
+            depth -= 1
+            if depth != 1:
+                continue
+            if element.tag == W + "style":
+                style_id = element.get(W + "styleId")
+                fonts[style_id] = _run_font(element.find(W + "rPr"))
+                parent = _style_id(element, W + "basedOn")
+                if parent:
+                    based_on[style_id] = parent
+                if element.get(W + "type") == "paragraph" and element.get(W + "default") in ("1", "true", "on"):
+                    default_paragraph_style = style_id
+            elif element.tag == W + "docDefaults":
+                defaults = _run_font(element.find(f"{W}rPrDefault/{W}rPr"))
+            root.remove(element)
+    return Styles(fonts, based_on, defaults, default_paragraph_style)
+
+
+def iter_paragraphs(archive, part=DOCUMENT_PART, styles=None):
+    """Yields the body paragraphs of a document part as Paragraphs, discarding each once read."""
+    body, depth = None, 0
+    with archive.open(part) as xml:
+        for event, element in ElementTree.iterparse(xml, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                if depth == 1 and element.tag != W + "document":
+                    raise InvalidDocumentError(f"{part} is not a Word document")
+                if depth == 2 and element.tag == W + "body":
+                    body = element
+                continue
+            depth -= 1
+            if body is None:
+                continue
+            if depth == 2:
+                # A direct child of w:body: a paragraph, table, section properties...
+                if element.tag == W + "p":
+                    yield _paragraph(element, styles)
+                body.remove(element)
+            elif depth > 3 and element.tag == W + "tc":
+                # Table cells are not body paragraphs; free them instead of holding whole tables
+                element.clear()
+            elif depth == 1:
+                body = None
+
+
+def iter_document(source, resolve_styles=False):
+    """Yields the body paragraphs of a DOCX given as bytes, a path or a binary file object."""
+    with open_archive(source) as archive:
+        try:
+            document, styles_part = part_names(archive)
+            styles = read_styles(archive, styles_part) if resolve_styles and styles_part else None
+            yield from iter_paragraphs(archive, document, styles)
+        except KeyError as e:
+            raise InvalidDocumentError(f"Missing part: {e}") from e
+        except (ElementTree.ParseError, zipfile.BadZipFile, EOFError) as e:
+            raise InvalidDocumentError(str(e)) from e
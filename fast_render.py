@@ -0,0 +1,227 @@
+"""Direct OOXML renderer for the default CV layout.
+
+Produces the same ``word/document.xml`` as ``json_to_cv.build_cv_document`` but
+writes it as text from precompiled fragments instead of going through
+python-docx's object model. Every other part of the package (styles, settings,
+theme, ...) is identical for every CV, so it is taken from the cached base
+document and compressed once; each render only deflates the document body and
+writes the ZIP container around it.
+
+Select it with ``engine="ooxml"``; ``tests/test_fast_render.py`` checks that it
+produces the same bytes as the python-docx output.
+"""
+import re
+import struct
+import threading
+import time
+import zipfile
+import zlib
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+import json_to_cv
+import template_cache
+
+DOCUMENT_PART = "word/document.xml"
+
+# lxml refuses these in text nodes, so python-docx fails on them too
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+_RUN_BREAKS = re.compile("([\t\r\n])")
+
+_BOLD = "<w:rPr><w:b/></w:rPr>"
+_SPACE_AFTER_0 = '<w:spacing w:after="0"/>'
+_CENTER = '<w:jc w:val="center"/>'
+_LEFT = '<w:jc w:val="left"/>'
+
+
+def _text(text):
+    if _INVALID_XML_CHARS.search(text):
+        raise ValueError("All strings must be XML compatible: Unicode or ASCII, no NULL bytes or control characters")
+    if len(text.strip()) < len(text):
+        return f'<w:t xml:space="preserve">{escape(text)}</w:t>'
+    return f"<w:t>{escape(text)}</w:t>"
+
+
+# Mirrors Run.text: tabs become <w:tab/>, line breaks <w:br/>
+def _run(text, rpr=""):
+    content = []
+    for piece in _RUN_BREAKS.split(text):
+        if piece == "\t":
+            content.append("<w:tab/>")
+        elif piece in ("\r", "\n"):
+            content.append("<w:br/>")
+        elif piece:
+            content.append(_text(piece))
+    if not rpr and not content:
+        return "<w:r/>"
+    return f"<w:r>{rpr}{''.join(content)}</w:r>"
+
+
+def _paragraph(runs="", ppr=""):
+    if not runs and not ppr:
+        return "<w:p/>"
+    ppr = f"<w:pPr>{ppr}</w:pPr>" if ppr else ""
+    return f"<w:p>{ppr}{runs}</w:p>"
+
+
+def _plain(text, ppr=""):
+    # doc.add_paragraph(text) only adds a run for non-empty text
+    return _paragraph(_run(text) if text else "", ppr)
+
+
+HORIZONTAL_LINE = _paragraph(_run("—" * 50, _BOLD), _CENTER)
+EMPTY_PARAGRAPH = _paragraph()
+
+
+def _section_title(title_text):
+    return HORIZONTAL_LINE + _paragraph(_run(title_text.upper(), _BOLD), _CENTER)
+
+
+def _bullet(text):
+    return _plain("• " + text, _SPACE_AFTER_0)
+
+
+# Same layout as json_to_cv.build_cv_document, section by section
+def render_body(data):
+    parts = []
+    add = parts.append
+
+    add(_paragraph(_run(data.get("name", "Your Name").upper(), '<w:rPr><w:b/><w:sz w:val="28"/></w:rPr>'), _CENTER))
+    add(_paragraph(
+        _run(data.get("phone", "Your Phone Number") + " • ", _BOLD)
+        + _run(data.get("email", "Your Email") + " • ", _BOLD)
+        + _run(data.get("contact", "Your Location"), _BOLD),
+        _CENTER,
+    ))
+    add(HORIZONTAL_LINE)
+
+    summary = data.get("summary", "")
+    if summary:
+        add(_paragraph(_run("SOFTWARE DEVELOPER", _BOLD), _CENTER))
+        add(_plain(summary, _CENTER))
+
+    skills = data.get("skills", [])
+    if skills:
+        add(_section_title("SKILLS"))
+        for skill_category in skills:
+            add(_paragraph(
+                _run(skill_category["category"] + ": ", _BOLD) + _run(", ".join(skill_category["items"])),
+                _LEFT,
+            ))
+
+    strengths = data.get("strengths_and_expertise", [])
+    if strengths:
+        add(_section_title("STRENGTHS AND EXPERTISE"))
+        for strength in strengths:
+            add(_bullet(strength))
+
+    experience = data.get("experience", [])
+    if experience:
+        add(_section_title("PROFESSIONAL EXPERIENCE"))
+        for job in experience:
+            add(_paragraph(
+                _run(job["title"] + " - " + job["company"], _BOLD) + _run(" " * 50 + job["dates"], _BOLD),
+                _LEFT,
+            ))
+            description = job.get("description", {})
+            intro = description.get("intro", "")
+            if intro:
+                add(_plain(intro))
+            details = description.get("details", [])
+            if details:
+                parts.extend(_bullet(line) for line in details)
+                add(EMPTY_PARAGRAPH)
+            accomplishments = job.get("accomplishments", [])
+            if accomplishments:
+                parts.extend(_bullet(acc) for acc in accomplishments)
+                add(EMPTY_PARAGRAPH)
+
+    if data.get("education"):
+        add(_section_title("EDUCATION"))
+        for edu in data.get("education", []):
+            add(_plain(f"{edu['degree']} - {edu['institution']} ({edu['year']})"))
+
+    return "".join(parts)
+
+
+class _PackageTemplate:
+    """The base document's parts, pre-compressed, plus document.xml split around the body."""
+
+    def __init__(self):
+        base = template_cache.new_document("json_to_cv", json_to_cv.apply_base_style)
+        buffer = BytesIO()
+        base.save(buffer)
+
+        self.entries = []  # (name, crc, compressed, size) or None for document.xml
+        with zipfile.ZipFile(buffer) as archive:
+            for name in archive.namelist():
+                blob = archive.read(name)
+                if name == DOCUMENT_PART:
+                    xml = blob.decode("utf-8")
+                    body_start = xml.index("<w:body>") + len("<w:body>")
+                    self.document_head = xml[:body_start].encode("utf-8")
+                    self.document_tail = xml[body_start:].encode("utf-8")
+                    self.entries.append(None)
+                else:
+                    self.entries.append((name.encode("utf-8"), zlib.crc32(blob), _deflate(blob), len(blob)))
+
+
+def _deflate(data):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _dos_time():
+    t = time.localtime()
+    return (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2), ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+
+
+# Writes a ZIP archive of already-deflated entries (the same layout zipfile produces)
+def _write_zip(entries):
+    dos_time, dos_date = _dos_time()
+    out = BytesIO()
+    central = []
+    for name, crc, compressed, size in entries:
+        offset = out.tell()
+        out.write(struct.pack("<4s2B4HL2L2H", b"PK\x03\x04", 20, 0, 0, zlib.DEFLATED, dos_time, dos_date,
+                              crc, len(compressed), size, len(name), 0))
+        out.write(name)
+        out.write(compressed)
+        central.append(struct.pack("<4s4B4HL2L5H2L", b"PK\x01\x02", 20, 3, 20, 0, 0, zlib.DEFLATED, dos_time, dos_date,
+                                   crc, len(compressed), size, len(name), 0, 0, 0, 0, 0o600 << 16, offset) + name)
+    central_offset = out.tell()
+    for record in central:
+        out.write(record)
+    central_size = out.tell() - central_offset
+    out.write(struct.pack("<4s4H2LH", b"PK\x05\x06", 0, 0, len(entries), len(entries), central_size, central_offset, 0))
+    return out.getvalue()
+
+
+_package = None
+_package_lock = threading.Lock()
+
+
+def _get_package():
+    global _package
+    if _package is None:
+        with _package_lock:
+            if _package is None:
+                _package = _PackageTemplate()
+    return _package
+
+
+def render_document_xml(data):
+    package = _get_package()
+    return package.document_head + render_body(data).encode("utf-8") + package.document_tail
+
+
+def render(data):
+    """Renders the default CV layout straight to DOCX bytes."""
+    package = _get_package()
+    document_xml = render_document_xml(data)
+    document_entry = (DOCUMENT_PART.encode("utf-8"), zlib.crc32(document_xml), _deflate(document_xml), len(document_xml))
+    return _write_zip([entry or document_entry for entry in package.entries])
+
+
+def warm_up():
+    _get_package()
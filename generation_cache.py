@@ -0,0 +1,174 @@
+"""Cache of generated DOCX files keyed by the canonical input JSON and template.
+
+Two tiers: a size-bounded in-memory LRU, and an optional directory of files whose
+entries expire after a TTL. Entries found on disk are promoted to memory.
+Request handlers use get_async/put_async, which move the disk tier off the event loop.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+
+# The same profile always gives the same key, whatever its key order or whitespace
+def make_key(data, template_id):
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(f"{template_id}\n{canonical}".encode("utf-8")).hexdigest()
+
+
+class GenerationCache:
+    def __init__(self, enabled=True, max_bytes=64 * 1024 * 1024, directory=None, ttl=24 * 3600):
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._puts = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if enabled and directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            enabled=os.getenv("CV_CACHE_ENABLED", "1") not in ("0", "false", "no"),
+            max_bytes=int(float(os.getenv("CV_CACHE_MAX_MB", "64")) * 1024 * 1024),
+            directory=os.getenv("CV_CACHE_DIR") or None,
+            ttl=int(os.getenv("CV_CACHE_TTL", str(24 * 3600))),
+        )
+
+    def get(self, key):
+        """Returns the cached DOCX bytes, or None."""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return value
+
+        value = self._disk_get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._memory_put(key, value)
+        return value
+
+    def put(self, key, value):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._memory_put(key, value)
+            self._puts += 1
+            sweep = self.directory and self._puts % 100 == 0
+        self._disk_put(key, value)
+        if sweep:
+            self.evict_expired()
+
+    async def get_async(self, key):
+        """get() for coroutines: memory hits are answered inline, disk lookups run in a thread."""
+        if self.enabled and self.directory:
+            with self._lock:
+                in_memory = key in self._entries
+            if not in_memory:
+                return await asyncio.to_thread(self.get, key)
+        return self.get(key)
+
+    async def put_async(self, key, value):
+        """put() for coroutines: the disk write and the expiry sweep run in a thread."""
+        if self.enabled and self.directory:
+            await asyncio.to_thread(self.put, key, value)
+        else:
+            self.put(key, value)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    # Callers hold the lock
+    def _memory_put(self, key, value):
+        if len(value) > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= len(old)
+        self._entries[key] = value
+        self._size += len(value)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".docx")
+
+    def _disk_get(self, key):
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                os.remove(path)
+                return None
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _disk_put(self, key, value):
+        if not self.directory:
+            return
+        tmp_path = None
+        try:
+            # Write then rename so readers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(value)
+            os.replace(tmp_path, self._path(key))
+            tmp_path = None
+        except OSError as e:
+            print(f"Error writing generation cache entry {key}: {e}")
+        finally:
+            # A failed write or rename must not leave the temp file behind
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    def evict_expired(self):
+        """Deletes disk entries older than the TTL."""
+        if not self.directory:
+            return
+        now = time.time()
+        for entry in os.scandir(self.directory):
+            try:
+                if entry.name.endswith(".docx") and now - entry.stat().st_mtime > self.ttl:
+                    os.remove(entry.path)
+            except OSError:
+                pass
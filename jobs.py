@@ -0,0 +1,269 @@
+"""SQLite-backed job queue for CV generation and ATS analysis.
+
+Clients submit work and get a job ID back straight away; ``JobWorkers`` (separate
+processes) claim queued jobs, run them and store the DOCX or ATS report in the
+same database, where clients poll for it. Everything lives in the database file,
+so queued jobs survive a restart. A claimed job carries a lease; if its worker
+dies, another worker picks it up once the lease expires (at most ``MAX_ATTEMPTS``
+times). Finished jobs and their results are deleted ``ttl`` seconds after they
+finish.
+"""
+import json
+import multiprocessing
+import os
+import signal
+import sqlite3
+import threading
+import time
+import uuid
+from collections import namedtuple
+
+DEFAULT_JOB_DB = "cv_jobs.db"
+DEFAULT_TTL = 3600
+DEFAULT_LEASE = 300
+DEFAULT_MAX_QUEUED = 1000
+MAX_ATTEMPTS = 3
+# How often an idle worker looks for new jobs, and how often it purges expired ones
+POLL_INTERVAL = 0.2
+CLEANUP_INTERVAL = 60
+
+# Workers are spawned, not forked: a fork taken while an API thread holds a JobStore lock
+# would leave the child blocked on a copy of that lock for good
+_SPAWN = multiprocessing.get_context("spawn")
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+FINISHED = (DONE, FAILED)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    params TEXT NOT NULL,
+    payload BLOB,
+    result BLOB,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    lease_until REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);
+"""
+
+Job = namedtuple("Job", ["id", "kind", "status", "params", "error", "attempts", "created_at", "started_at", "finished_at"])
+_JOB_COLUMNS = ", ".join(Job._fields)
+
+
+class QueueFullError(RuntimeError):
+    """Raised when as many jobs are already waiting as the store allows."""
+
+
+# Job kinds: each turns the stored payload and params into the result bytes
+def run_generate(payload, params):
+    import template_registry
+    return template_registry.render(json.loads(payload), params["template"], params["engine"])
+
+
+def run_ats_check(payload, params):
+    from ats_analysis import analyze_content, build_report
+    report = build_report(analyze_content(payload, params["filename"]), params["filename"])
+    return json.dumps(report).encode("utf-8")
+
+
+KINDS = {
+    "generate": run_generate,
+    "ats-check": run_ats_check,
+}
+
+
+def _row_to_job(row):
+    return Job(*row[:3], json.loads(row[3]), *row[4:]) if row else None
+
+
+class JobStore:
+    """The queue's database file. Each process (API or worker) opens its own connection on first use."""
+
+    def __init__(self, path=DEFAULT_JOB_DB, ttl=DEFAULT_TTL, lease=DEFAULT_LEASE, max_queued=DEFAULT_MAX_QUEUED):
+        self.path = path
+        self.ttl = ttl
+        self.lease = lease
+        self.max_queued = max_queued
+        self._db = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            os.getenv("CV_JOB_DB", DEFAULT_JOB_DB),
+            ttl=int(os.getenv("CV_JOB_TTL", DEFAULT_TTL)),
+            lease=int(os.getenv("CV_JOB_TIMEOUT", DEFAULT_LEASE)),
+            max_queued=int(os.getenv("CV_JOB_MAX_QUEUED", DEFAULT_MAX_QUEUED)),
+        )
+
+    # Spawned workers receive a pickled copy, without the connection or the lock
+    def __getstate__(self):
+        return {"path": self.path, "ttl": self.ttl, "lease": self.lease, "max_queued": self.max_queued}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    # A connection must not cross a fork, so a forked worker reconnects
+    @property
+    def db(self):
+        if self._db is None or self._pid != os.getpid():
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+            self._db, self._pid = db, os.getpid()
+        return self._db
+
+    def submit(self, kind, payload, params, result=None):
+        """Queues a job and returns its ID; a job whose result is already known (a cache hit) is stored as done."""
+        if kind not in KINDS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            if result is None:
+                queued = self.db.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED,)).fetchone()[0]
+                if queued >= self.max_queued:
+                    raise QueueFullError("Too many jobs are waiting, please retry shortly.")
+                self.db.execute("INSERT INTO jobs (id, kind, status, params, payload, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                                (job_id, kind, QUEUED, json.dumps(params), payload, now))
+            else:
+                self.db.execute("INSERT INTO jobs (id, kind, status, params, result, created_at, started_at, finished_at) "
+                                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (job_id, kind, DONE, json.dumps(params), result, now, now, now))
+        return job_id
+
+    def get(self, job_id):
+        with self._lock:
+            row = self.db.execute(f"SELECT {_JOB_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _row_to_job(row)
+
+    def result(self, job_id):
+        """(Job, result bytes) for a job; the result is None until the job is done."""
+        with self._lock:
+            row = self.db.execute(f"SELECT {_JOB_COLUMNS}, result FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return (_row_to_job(row[:-1]), row[-1]) if row else (None, None)
+
+    def counts(self):
+        # Reporting on a queue nobody has used yet should not create its database file
+        if self._db is None and not os.path.exists(self.path):
+            return {}
+        with self._lock:
+            return dict(self.db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    def claim(self):
+        """Marks the oldest waiting job (or one whose worker's lease ran out) as running; returns (Job, payload) or None."""
+        now = time.time()
+        with self._lock:
+            db = self.db
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                row = db.execute(f"SELECT {_JOB_COLUMNS}, payload FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1",
+                                 (QUEUED,)).fetchone()
+                if row is None:
+                    row = db.execute(f"SELECT {_JOB_COLUMNS}, payload FROM jobs WHERE status = ? AND lease_until < ? "
+                                     "ORDER BY created_at LIMIT 1", (RUNNING, now)).fetchone()
+                if row is not None and row[5] >= MAX_ATTEMPTS:
+                    db.execute("UPDATE jobs SET status = ?, error = ?, payload = NULL, finished_at = ?, lease_until = NULL "
+                               "WHERE id = ?", (FAILED, f"Gave up after {row[5]} attempts.", now, row[0]))
+                    row = None
+                if row is not None:
+                    db.execute("UPDATE jobs SET status = ?, attempts = attempts + 1, started_at = ?, lease_until = ? WHERE id = ?",
+                               (RUNNING, now, now + self.lease, row[0]))
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        return (_row_to_job(row[:-1]), row[-1]) if row else None
+
+    def finish(self, job_id, result=None, error=None):
+        with self._lock:
+            self.db.execute("UPDATE jobs SET status = ?, result = ?, error = ?, payload = NULL, finished_at = ?, "
+                            "lease_until = NULL WHERE id = ?",
+                            (FAILED if error is not None else DONE, result, error, time.time(), job_id))
+
+    def cleanup(self):
+        """Deletes jobs that finished more than ttl seconds ago; returns how many."""
+        with self._lock:
+            cursor = self.db.execute(f"DELETE FROM jobs WHERE status IN ({', '.join('?' * len(FINISHED))}) AND finished_at < ?",
+                                     (*FINISHED, time.time() - self.ttl))
+        return cursor.rowcount
+
+
+def run_job(store, job, payload):
+    try:
+        result = KINDS[job.kind](payload, job.params)
+    except Exception as e:
+        store.finish(job.id, error=str(e) or type(e).__name__)
+    else:
+        store.finish(job.id, result=result)
+
+
+# Body of a worker process: claim, run, repeat until told to stop
+def work(store, stop):
+    # Ctrl+C reaches the whole process group; the parent decides when workers stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    from worker_pool import _init_worker
+    _init_worker()
+
+    last_cleanup = 0
+    while not stop.is_set():
+        claimed = store.claim()
+        if claimed is not None:
+            run_job(store, *claimed)
+            continue
+        if time.time() - last_cleanup > CLEANUP_INTERVAL:
+            store.cleanup()
+            last_cleanup = time.time()
+        stop.wait(POLL_INTERVAL)
+
+
+class JobWorkers:
+    """Local worker processes draining a JobStore, started on demand. A worker that dies is replaced on the next submission."""
+
+    def __init__(self, store, count):
+        self.store = store
+        self.count = count
+        self._stop = None
+        self._processes = []
+
+    @classmethod
+    def from_env(cls, store):
+        return cls(store, int(os.getenv("CV_JOB_WORKERS", 1)))
+
+    def start(self):
+        """Starts the workers, or replaces any that died; cheap to call on every submission."""
+        if self._stop is None:
+            self._stop = _SPAWN.Event()
+        self.ensure_running()
+
+    def ensure_running(self):
+        if self._stop is None or self._stop.is_set():
+            return
+        self._processes = [process for process in self._processes if process.is_alive()]
+        while len(self._processes) < self.count:
+            process = _SPAWN.Process(target=work, args=(self.store, self._stop), name="cv-job-worker", daemon=True)
+            process.start()
+            self._processes.append(process)
+
+    @property
+    def alive(self):
+        return sum(process.is_alive() for process in self._processes)
+
+    def shutdown(self, timeout=30):
+        """Lets each worker finish its current job; unfinished jobs stay in the store for the next start."""
+        if self._stop is None:
+            return
+        self._stop.set()
+        deadline = time.monotonic() + timeout
+        for process in self._processes:
+            process.join(max(0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+        self._stop = None
@@ -1,8 +1,8 @@
 import json
-from docx import Document
 from docx.shared import Pt, Inches
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
 import os
+import template_cache
 
 def add_horizontal_line(doc):
     """Adds a single horizontal line to the document."""
@@ -98,75 +98,27 @@ def add_experience_section(doc, experience):
                 # Add a blank paragraph for spacing after accomplishments
                 doc.add_paragraph()
 
-def create_cv_from_json(json_file, output_docx):
-    with open(json_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    doc = Document()
+def apply_base_style(doc):
+    """Sets the page margins and the Arial 10.5pt Normal style every CV starts with."""
     sections = doc.sections
     for section in sections:
         section.top_margin = Inches(0.5)
         section.bottom_margin = Inches(0.5)
         section.left_margin = Inches(0.75)
         section.right_margin = Inches(0.75)
-    
+
     style = doc.styles['Normal']
     style.font.name = 'Arial'
     style.font.size = Pt(10.5)
-    
-    # Name at the top
-    name = doc.add_paragraph()
-    name.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-    run = name.add_run(data.get("name", "Your Name").upper())
-    run.bold = True
-    run.font.size = Pt(14)
-    
-    # Contact Info
-    contact = doc.add_paragraph()
-    contact.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-    contact.add_run(data.get("phone", "Your Phone Number") + " • ").bold = True
-    contact.add_run(data.get("email", "Your Email") + " • ").bold = True
-    contact.add_run(data.get("contact", "Your Location")).bold = True
-    
-    add_horizontal_line(doc)
-    
-    # Summary
-    add_text_section(doc, "SOFTWARE DEVELOPER", data.get("summary", ""), WD_PARAGRAPH_ALIGNMENT.CENTER)
-    
-    # Skills and Strengths
-    add_skills_section(doc, data.get("skills", []))
-    add_strengths_and_expertise_section(doc, data.get("strengths_and_expertise", []))
-    
-    # Experience
-    add_experience_section(doc, data.get("experience", []))
-    
-    # Education (if needed)
-    if data.get("education"):
-        add_section_title(doc, "EDUCATION")
-        for edu in data.get("education", []):
-            doc.add_paragraph(f"{edu['degree']} - {edu['institution']} ({edu['year']})")
 
-    doc.save(output_docx)
-    print(f"CV saved as {output_docx}")
+# Prepare the cached base document ahead of the first CV
+def warm_up():
+    template_cache.new_document("json_to_cv", apply_base_style)
 
+def build_cv_document(data):
+    """Builds the CV layout used by the API and the CLI and returns the unsaved Document."""
+    doc = template_cache.new_document("json_to_cv", apply_base_style)
 
-def create_cv_for_api(json_file, output_docx):
-    data = json_file
-    # with open(json_file, 'r', encoding='utf-8') as f:
-    #     data = json.load(f)
-    
-    doc = Document()
-    sections = doc.sections
-    for section in sections:
-        section.top_margin = Inches(0.5)
-        section.bottom_margin = Inches(0.5)
-        section.left_margin = Inches(0.75)
-        section.right_margin = Inches(0.75)
-    
-    style = doc.styles['Normal']
-    style.font.name = 'Arial'
-    style.font.size = Pt(10.5)
-    
     # Name at the top
     name = doc.add_paragraph()
     name.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
@@ -199,13 +151,66 @@ def create_cv_for_api(json_file, output_docx):
         for edu in data.get("education", []):
             doc.add_paragraph(f"{edu['degree']} - {edu['institution']} ({edu['year']})")
 
+    return doc
+
+
+def create_cv_from_json(json_file, output_docx):
+    template_cache.save_from_json(build_cv_document, json_file, output_docx)
+
+
+def create_cv_for_api(json_file, output_docx):
+    doc = build_cv_document(json_file)
     doc.save(output_docx)
     print(f"CV saved as {output_docx}")
 
 
+def render_cv_for_api(data):
+    return template_cache.render(build_cv_document, data)
+
+
+# Common entry point shared with templates/template_*.py, see template_registry
+render = render_cv_for_api
+
+
 if __name__ == "__main__":
+    import argparse
+    import sys
+    import template_registry
+
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        from batch import run_batch, print_stats
+
+        parser = argparse.ArgumentParser(prog="json_to_cv.py batch", description="Generate CVs for many JSON profiles in parallel.")
+        parser.add_argument("source", help="Directory of .json files, a glob pattern, a .jsonl file, or - for JSONL on stdin")
+        parser.add_argument("-o", "--output-dir", default="output", help="Where to write the DOCX files (default: %(default)s)")
+        parser.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+        parser.add_argument("-t", "--template", default=template_registry.DEFAULT_TEMPLATE, choices=template_registry.available_templates())
+        parser.add_argument("-e", "--engine", default=template_registry.DEFAULT_ENGINE, choices=list(template_registry.ENGINES))
+        args = parser.parse_args(sys.argv[2:])
+        try:
+            template_registry.check_engine(args.template, args.engine)
+        except template_registry.UnknownTemplateError as e:
+            parser.error(str(e))
+
+        stats = run_batch(args.source, args.output_dir, workers=args.workers, template_id=args.template, engine=args.engine)
+        print_stats(stats)
+        sys.exit(1 if stats["failed"] else 0)
+
+    parser = argparse.ArgumentParser(description="Generate a CV from a JSON profile and run the ATS checks on it.")
+    parser.add_argument("-i", "--input", default=os.getenv("INPUT_JSON", "cv_data.json"))
+    parser.add_argument("-o", "--output", default=os.getenv("OUTPUT_DOCX", "output_cv.docx"))
+    parser.add_argument("-t", "--template", default=os.getenv("CV_TEMPLATE", template_registry.DEFAULT_TEMPLATE), choices=template_registry.available_templates())
+    parser.add_argument("-e", "--engine", default=template_registry.DEFAULT_ENGINE, choices=list(template_registry.ENGINES))
+    args = parser.parse_args()
+    try:
+        template_registry.check_engine(args.template, args.engine)
+    except template_registry.UnknownTemplateError as e:
+        parser.error(str(e))
+
     from ats_analysis import analyze_cv
-    input_json = os.getenv("INPUT_JSON", "cv_data.json")
-    output_docx = os.getenv("OUTPUT_DOCX", "output_cv.docx")
-    create_cv_from_json(input_json, output_docx)
-    analyze_cv("/app/output/output_cv.docx", "John Doe")
+    with open(args.input, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    with open(args.output, 'wb') as f:
+        f.write(template_registry.render(data, args.template, args.engine))
+    print(f"CV saved as {args.output}")
+    analyze_cv(args.output, "John Doe")
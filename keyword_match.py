@@ -0,0 +1,181 @@
+"""Scores CVs against a job description with TF-IDF weighted cosine similarity.
+
+Every text is reduced to counts of its terms: lower-cased words, keeping names
+such as ``node.js``, ``c++`` or ``ci/cd`` whole, minus stop words and numbers.
+The CVs become rows of one SciPy CSR matrix, so weighting, normalizing and
+scoring thousands of them is a few sparse matrix operations rather than a
+Python loop. IDF is computed over the job description
+and the CVs scored with it, with the same smoothing as scikit-learn
+(``ln((1 + n) / (1 + df)) + 1``); term frequencies are dampened with ``1 + ln(tf)``.
+
+The job description's keywords are its highest-weighted terms; each result lists
+the ones the CV lacks.
+
+    python keyword_match.py job.txt cv1.docx cv2.json ... [--top 10]
+"""
+import json
+import os
+from collections import Counter, namedtuple
+
+import numpy as np
+from scipy import sparse
+
+DEFAULT_MAX_KEYWORDS = 30
+
+STOP_WORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below between
+both but by can could did do does doing down during each etc few for from further had has have having he her here
+hers him his how i if in into is it its itself just me more most must my no nor not of off on once only or other
+our ours out over own per same she should so some such than that the their theirs them then there these they this
+those through to too under until up us very via was we were what when where which while who whom why will with
+within without would you your yours
+""".split())
+
+MatchResult = namedtuple("MatchResult", ["label", "score", "coverage", "matched", "missing"])
+
+
+# Punctuation that separates words. ".", "-", "/", "+" and "#" stay inside a term ("node.js", "ci/cd",
+# "c++") and are only stripped from its ends. str.translate + split is ~3x faster than a regex findall.
+_SEPARATORS = str.maketrans({c: " " for c in ",;:!?()[]{}<>\"'`‘’“”@$%&*•|=~^"})
+
+
+def _normalize(token):
+    term = token.strip(".-/_")
+    if len(term) > 1 and term not in STOP_WORDS and any(c.isalpha() for c in term):
+        return term
+    return None
+
+
+def term_counts(text, normalized=None):
+    """Counter of the content words of a text.
+
+    ``normalized`` is a dict caching token -> term (or None) across calls; most tokens repeat
+    from one CV to the next.
+    """
+    if normalized is None:
+        normalized = {}
+    counts = Counter()
+    for token, count in Counter(text.lower().translate(_SEPARATORS).split()).items():
+        term = normalized.get(token, "")
+        if term == "":
+            term = normalized[token] = _normalize(token)
+        if term is not None:
+            counts[term] += count
+    return counts
+
+
+# All strings of a generation JSON profile (cv_data.example.json's schema or a template's)
+def profile_text(data):
+    if isinstance(data, str):
+        return data
+    if isinstance(data, dict):
+        return "\n".join(profile_text(value) for value in data.values())
+    if isinstance(data, list):
+        return "\n".join(profile_text(value) for value in data)
+    return ""
+
+
+class KeywordMatcher:
+    """A job description, ready to score any number of CVs against."""
+
+    def __init__(self, job_description, max_keywords=DEFAULT_MAX_KEYWORDS):
+        self.job_counts = term_counts(job_description)
+        if not self.job_counts:
+            raise ValueError("The job description has no keywords.")
+        self.max_keywords = max_keywords
+
+    def score(self, cvs):
+        """Scores (label, text) pairs; returns MatchResults in the same order."""
+        cvs = list(cvs)
+        if not cvs:
+            return []
+
+        # Vocabulary: the job description's terms first, so its vector is columns [0, len(job_terms))
+        vocabulary = {term: index for index, term in enumerate(self.job_counts)}
+        indptr, indices, counts = [0], [], []
+        normalized = {}
+        for _, text in cvs:
+            for term, count in term_counts(text, normalized).items():
+                indices.append(vocabulary.setdefault(term, len(vocabulary)))
+                counts.append(count)
+            indptr.append(len(indices))
+
+        n_terms = len(vocabulary)
+        matrix = sparse.csr_matrix((np.asarray(counts, dtype=np.float64), indices, indptr), shape=(len(cvs), n_terms))
+        job_terms = len(self.job_counts)
+        job = np.zeros(n_terms)
+        job[:job_terms] = np.fromiter(self.job_counts.values(), dtype=np.float64, count=job_terms)
+
+        # Smoothed IDF over the CVs plus the job description
+        df = np.bincount(matrix.indices, minlength=n_terms).astype(np.float64)
+        df[:job_terms] += 1
+        idf = np.log((1 + len(cvs) + 1) / (1 + df)) + 1
+
+        matrix.data = 1 + np.log(matrix.data)
+        matrix = matrix.multiply(idf).tocsr()
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+
+        job_weights = np.zeros(n_terms)
+        job_weights[:job_terms] = (1 + np.log(job[:job_terms])) * idf[:job_terms]
+        job_weights /= np.linalg.norm(job_weights)
+        scores = (matrix @ job_weights) / norms
+
+        # The job description's keywords: its top-weighted terms
+        keyword_count = min(self.max_keywords, job_terms)
+        keyword_columns = np.argsort(-job_weights[:job_terms], kind="stable")[:keyword_count]
+        job_term_list = list(self.job_counts)
+        keywords = [job_term_list[column] for column in keyword_columns]
+        present = matrix[:, keyword_columns].toarray() > 0
+
+        results = []
+        for row, (label, _) in enumerate(cvs):
+            matched = [keyword for keyword, found in zip(keywords, present[row]) if found]
+            missing = [keyword for keyword, found in zip(keywords, present[row]) if not found]
+            results.append(MatchResult(label, round(float(scores[row]), 4),
+                                       round(len(matched) / keyword_count, 4), matched, missing))
+        return results
+
+    def rank(self, cvs, top=None):
+        """Scores (label, text) pairs and returns the best matches first."""
+        results = sorted(self.score(cvs), key=lambda result: result.score, reverse=True)
+        return results[:top] if top else results
+
+
+def match(job_description, cv_text, label="cv"):
+    return KeywordMatcher(job_description).score([(label, cv_text)])[0]
+
+
+# Text of a CV file: a DOCX goes through the ATS snapshot, JSON is a generation profile
+def read_cv(path):
+    if path.lower().endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            return profile_text(json.load(f))
+    from ats_analysis import read_docx
+    return read_docx(path)
+
+
+# Worker-pool entry point for the API: ranks (filename, DOCX bytes) and (label, JSON profile) pairs
+def rank_documents(job_description, documents=(), profiles=(), top=None, max_keywords=DEFAULT_MAX_KEYWORDS):
+    from document_snapshot import DocumentSnapshot
+    cvs = [(filename, DocumentSnapshot.from_bytes(contents, filename).text) for filename, contents in documents]
+    cvs += [(label, profile_text(data)) for label, data in profiles]
+    return [result._asdict() for result in KeywordMatcher(job_description, max_keywords).rank(cvs, top)]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rank CVs (.docx or generation .json) against a job description.")
+    parser.add_argument("job_description", help="Text file with the job description")
+    parser.add_argument("cvs", nargs="+")
+    parser.add_argument("--top", type=int, default=None)
+    parser.add_argument("--keywords", type=int, default=DEFAULT_MAX_KEYWORDS, help="Job description keywords to check")
+    args = parser.parse_args()
+
+    with open(args.job_description, "r", encoding="utf-8") as f:
+        matcher = KeywordMatcher(f.read(), args.keywords)
+    for result in matcher.rank([(os.path.basename(path), read_cv(path)) for path in args.cvs], args.top):
+        print(f"{result.score:.3f}  {result.coverage:5.0%}  {result.label}")
+        if result.missing:
+            print(f"       missing: {', '.join(result.missing)}")
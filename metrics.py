@@ -0,0 +1,230 @@
+"""In-process metrics exposed in the Prometheus text format.
+
+Counters, gauges and histograms are plain objects guarded by one lock each, so
+recording a value costs a dictionary lookup and an addition. Stage timings taken
+with ``timed()`` inside worker processes are collected per job and shipped back
+with the result (see worker_pool), so ``/metrics`` on the API process covers the
+whole pipeline. Numbers are per API process.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry = []
+_collectors = []
+
+
+def _label_key(labelnames, labels):
+    return tuple(str(labels.get(name, "")) for name in labelnames)
+
+
+def _format_labels(labelnames, key, extra=()):
+    pairs = list(zip(labelnames, key)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    # For mirroring a count that is kept elsewhere (e.g. a cache's own hit counter)
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[_label_key(self.labelnames, labels)] = value
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[_label_key(self.labelnames, labels)] = value
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track(self, **labels):
+        """Counts the enclosed block as in progress."""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = _label_key(self.labelnames, labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                # Per-bucket counts (not cumulative) + the +Inf bucket, then sum
+                series = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            snapshot = sorted((key, list(counts), total) for key, (counts, total) in self._values.items())
+        for key, counts, total in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = _format_labels(self.labelnames, key, [("le", _format_value(bound))])
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+STAGE_SECONDS = Histogram("cv_stage_seconds", "Time spent in each generation and analysis stage.", ["stage"])
+REQUEST_SECONDS = Histogram("cv_http_request_seconds", "HTTP request latency.", ["path", "method", "status"])
+IN_FLIGHT = Gauge("cv_http_requests_in_flight", "HTTP requests currently being handled.", ["path"])
+ERRORS = Counter("cv_errors_total", "Requests that ended in an error, by endpoint and kind.", ["endpoint", "kind"])
+
+_local = threading.local()
+
+
+class timed:
+    """Records how long the enclosed block takes under cv_stage_seconds{stage=...} (a few microseconds)."""
+
+    __slots__ = ("stage", "start", "elapsed")
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.elapsed = elapsed = time.perf_counter() - self.start
+        collected = getattr(_local, "collected", None)
+        if collected is not None:
+            collected.append((self.stage, elapsed))
+        else:
+            STAGE_SECONDS.observe(elapsed, stage=self.stage)
+
+
+@contextmanager
+def collect():
+    """Gathers the timed() stages of the enclosed block into a list instead of recording them.
+
+    Used around jobs that run in a worker process, whose metrics would otherwise never
+    reach the API process; pass the list to record_stages() on the other side.
+    """
+    previous = getattr(_local, "collected", None)
+    _local.collected = collected = []
+    try:
+        yield collected
+    finally:
+        _local.collected = previous
+
+
+def record_stages(stages):
+    for stage, elapsed in stages:
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+
+
+def add_collector(fn):
+    """Registers fn() to be called before every export, to refresh metrics kept elsewhere."""
+    _collectors.append(fn)
+    return fn
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware recording latency (until the last body chunk is sent) and in-flight requests.
+
+    Requests are labelled by path only when it is one of ``paths``, so the number of
+    series stays fixed whatever URLs clients try.
+    """
+
+    def __init__(self, app, paths):
+        self.app = app
+        self.paths = set(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"] if scope["path"] in self.paths else "other"
+        status = 500
+
+        async def send_and_record_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        with IN_FLIGHT.track(path=path):
+            try:
+                await self.app(scope, receive, send_and_record_status)
+            finally:
+                REQUEST_SECONDS.observe(time.perf_counter() - start, path=path, method=scope["method"], status=status)
+
+
+def export():
+    """Returns every metric in the Prometheus text exposition format."""
+    for fn in _collectors:
+        fn()
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
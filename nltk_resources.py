@@ -0,0 +1,70 @@
+"""Locates the NLTK tokenizer data without ever touching the network.
+
+Importing this module only inspects the filesystem; it does not import nltk. The
+data is fetched ahead of time, at image build or during local setup, with:
+
+    python nltk_resources.py [--dir DIR]
+"""
+import argparse
+import os
+import sys
+
+# Resources word_tokenize needs
+REQUIRED_RESOURCES = {
+    "punkt": os.path.join("tokenizers", "punkt"),
+    "punkt_tab": os.path.join("tokenizers", "punkt_tab"),
+}
+
+# Copy shipped next to the code, filled by running this module
+BUNDLED_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "nltk_data")
+
+
+# Directories NLTK will search, in its own order, with the bundled copy first
+def search_paths():
+    paths = [BUNDLED_DATA_DIR]
+    paths += [p for p in os.environ.get("NLTK_DATA", "").split(os.pathsep) if p]
+    paths += [
+        os.path.join(os.path.expanduser("~"), "nltk_data"),
+        os.path.join(sys.prefix, "nltk_data"),
+        os.path.join(sys.prefix, "share", "nltk_data"),
+        os.path.join(sys.prefix, "lib", "nltk_data"),
+        "/usr/share/nltk_data",
+        "/usr/local/share/nltk_data",
+        "/usr/lib/nltk_data",
+        "/usr/local/lib/nltk_data",
+    ]
+    return paths
+
+
+# Point NLTK at the bundled copy; must run before nltk is first imported
+def configure():
+    if not os.path.isdir(BUNDLED_DATA_DIR):
+        return
+    paths = [p for p in os.environ.get("NLTK_DATA", "").split(os.pathsep) if p]
+    if BUNDLED_DATA_DIR not in paths:
+        os.environ["NLTK_DATA"] = os.pathsep.join([BUNDLED_DATA_DIR] + paths)
+    if "nltk.data" in sys.modules and BUNDLED_DATA_DIR not in sys.modules["nltk.data"].path:
+        sys.modules["nltk.data"].path.insert(0, BUNDLED_DATA_DIR)
+
+
+def missing_resources():
+    paths = search_paths()
+    return [
+        name for name, relative in REQUIRED_RESOURCES.items()
+        if not any(os.path.exists(os.path.join(p, relative)) or os.path.exists(os.path.join(p, relative + ".zip")) for p in paths)
+    ]
+
+
+def download(target_dir=BUNDLED_DATA_DIR):
+    import nltk
+    for name in REQUIRED_RESOURCES:
+        if not nltk.download(name, download_dir=target_dir, quiet=True):
+            raise SystemExit(f"Failed to download NLTK resource '{name}'")
+    print(f"NLTK data saved to {target_dir}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Download the NLTK tokenizer data used by the ATS checks.")
+    parser.add_argument("--dir", default=BUNDLED_DATA_DIR, help="Target directory (default: %(default)s)")
+    args = parser.parse_args()
+    download(args.dir)
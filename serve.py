@@ -0,0 +1,136 @@
+"""Production server: one preloading parent process and N forked uvicorn workers.
+
+The parent imports the app, loads the spelling dictionary, tokenizer data and CV
+templates once, freezes the garbage collector (so collections in the workers do not
+touch, and thereby copy, the inherited objects) and binds the listening socket.
+Each worker is forked from it and shares those read-only structures copy-on-write
+instead of loading its own. A worker exits after ``--max-requests`` requests (plus
+some jitter, so they do not all restart at once) and the parent forks a fresh one,
+which bounds memory growth.
+
+    python serve.py [--workers 4] [--port 8888] [--max-requests 10000]
+
+Unlike ``uvicorn api:app --reload`` there is no file watcher; use that for development.
+"""
+import argparse
+import gc
+import os
+import random
+import signal
+import socket
+import sys
+import time
+
+# Workers that die this soon after starting are respawned with a delay, so a broken app does not fork in a loop
+MIN_WORKER_LIFETIME = 1.0
+
+
+def preload():
+    """Imports the app and loads everything the workers only read."""
+    import api
+    api.warm_up()
+
+    # Everything allocated so far is shared with the workers; keep the collector off it
+    gc.collect()
+    gc.freeze()
+    return api.app
+
+
+def bind(host, port, backlog=2048):
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+# Runs in the forked child; returns when the worker has served its requests or was told to stop
+def run_worker(app, sock, args):
+    import uvicorn
+
+    for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGCHLD):
+        signal.signal(sig, signal.SIG_DFL)
+    max_requests = args.max_requests + random.randint(0, args.max_requests_jitter) if args.max_requests else None
+    config = uvicorn.Config(app, limit_max_requests=max_requests, timeout_keep_alive=args.keep_alive,
+                            log_level=args.log_level, access_log=args.access_log, proxy_headers=True)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class Arbiter:
+    """Keeps ``workers`` children serving the socket until SIGTERM or SIGINT."""
+
+    def __init__(self, app, sock, args):
+        self.app = app
+        self.sock = sock
+        self.args = args
+        self.children = {}
+        self.stopping = False
+
+    def spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            status = 0
+            try:
+                run_worker(self.app, self.sock, self.args)
+            except BaseException as e:
+                print(f"Worker {os.getpid()} failed: {e!r}", file=sys.stderr)
+                status = 1
+            finally:
+                os._exit(status)
+        self.children[pid] = time.monotonic()
+
+    def stop(self, signum, frame):
+        self.stopping = True
+        for pid in self.children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        for _ in range(self.args.workers):
+            self.spawn()
+        print(f"Serving on {self.args.host}:{self.args.port} with {self.args.workers} workers (parent {os.getpid()})")
+
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            started = self.children.pop(pid, None)
+            if started is None or self.stopping:
+                continue
+            if time.monotonic() - started < MIN_WORKER_LIFETIME:
+                time.sleep(MIN_WORKER_LIFETIME)
+            print(f"Worker {pid} exited ({os.waitstatus_to_exitcode(status)}), starting a new one")
+            self.spawn()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the API with preforked workers.")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", 8888)))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("CV_SERVER_WORKERS", os.cpu_count() or 1)))
+    parser.add_argument("--max-requests", type=int, default=int(os.getenv("CV_MAX_REQUESTS", 10000)),
+                        help="Requests a worker serves before it is replaced (0: never)")
+    parser.add_argument("--max-requests-jitter", type=int, default=int(os.getenv("CV_MAX_REQUESTS_JITTER", 1000)))
+    parser.add_argument("--keep-alive", type=int, default=5, help="Seconds an idle keep-alive connection stays open")
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--access-log", action=argparse.BooleanOptionalAction, default=True)
+    args = parser.parse_args()
+
+    # Every HTTP worker has its own CPU pool; by default they share the cores instead of each taking all of them
+    os.environ.setdefault("CV_WORKERS", str(max(1, (os.cpu_count() or 1) // max(args.workers, 1))))
+
+    sock = bind(args.host, args.port)
+    app = preload()
+    Arbiter(app, sock, args).run()
+
+
+if __name__ == "__main__":
+    main()
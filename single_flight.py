@@ -0,0 +1,70 @@
+"""Request coalescing: identical concurrent computations run once.
+
+``SingleFlight.run(key, fn, ...)`` starts ``fn`` as its own task the first time a
+key is seen; every call with the same key that arrives while that task is still
+running awaits the same task instead of starting another. All of them get its
+result or its exception. A caller that is cancelled (say, the client went away)
+only stops waiting: the computation carries on for the others, and is cancelled
+only once nobody is waiting for it any more. The key is forgotten as soon as the
+task finishes, so later calls start afresh (and usually hit a cache).
+
+Calls that joined an existing computation are counted in
+``cv_coalesced_requests_total``.
+"""
+import asyncio
+
+import metrics
+
+COALESCED = metrics.Counter("cv_coalesced_requests_total",
+                            "Requests that waited for an identical computation already in flight.", ["kind"])
+IN_FLIGHT = metrics.Gauge("cv_single_flight_in_flight", "Distinct computations currently running.", ["kind"])
+
+
+class _Call:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """In-flight computations of one kind (e.g. "generation"), keyed by a content hash. One per event loop."""
+
+    def __init__(self, kind):
+        self.kind = kind
+        self._calls = {}
+
+    def __len__(self):
+        return len(self._calls)
+
+    async def run(self, key, fn, *args, **kwargs):
+        """Returns the result of ``await fn(*args, **kwargs)``, shared with concurrent calls for the same key."""
+        call = self._calls.get(key)
+        if call is None:
+            call = self._calls[key] = _Call(asyncio.ensure_future(fn(*args, **kwargs)))
+            call.task.add_done_callback(lambda task, key=key, call=call: self._finished(key, call))
+            IN_FLIGHT.set(len(self._calls), kind=self.kind)
+        else:
+            COALESCED.inc(kind=self.kind)
+
+        call.waiters += 1
+        try:
+            # shield: cancelling this caller must not cancel the computation the others are waiting for
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                self._forget(key, call)
+                call.task.cancel()
+
+    def _forget(self, key, call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+            IN_FLIGHT.set(len(self._calls), kind=self.kind)
+
+    def _finished(self, key, call):
+        self._forget(key, call)
+        # Retrieve the outcome so an error nobody waited for is not reported as "never retrieved"
+        if not call.task.cancelled():
+            call.task.exception()
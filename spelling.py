@@ -0,0 +1,79 @@
+import threading
+from collections import OrderedDict
+
+from spellchecker import SpellChecker
+
+# Number of token verdicts kept in memory before the least recently used are dropped
+DEFAULT_CACHE_SIZE = 50000
+
+
+class SpellingEngine:
+    """Spell checker that loads its dictionary once and remembers token verdicts."""
+
+    def __init__(self, language="en", cache_size=DEFAULT_CACHE_SIZE):
+        self._spell = SpellChecker(language=language)
+        self._cache_size = cache_size
+        self._verdicts = OrderedDict()  # lowercased token -> True if known
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def unknown(self, words):
+        """Returns the set of misspelled (lowercased) words, like SpellChecker.unknown."""
+        return self.unknown_batch([words])[0]
+
+    def unknown_batch(self, documents):
+        """Returns one misspelled-word set per document, checking each distinct token once."""
+        lowered = [[word.lower() for word in words] for words in documents]
+        distinct = set()
+        for words in lowered:
+            distinct.update(words)
+
+        with self._lock:
+            verdicts = {}
+            pending = []
+            for word in distinct:
+                known = self._verdicts.get(word)
+                if known is None:
+                    pending.append(word)
+                else:
+                    self._verdicts.move_to_end(word)
+                    verdicts[word] = known
+            self.hits += len(distinct) - len(pending)
+            self.misses += len(pending)
+
+            if pending:
+                misspelled = self._spell.unknown(pending)
+                for word in pending:
+                    known = word not in misspelled
+                    verdicts[word] = known
+                    self._verdicts[word] = known
+                while len(self._verdicts) > self._cache_size:
+                    self._verdicts.popitem(last=False)
+
+        return [{word for word in words if not verdicts[word]} for words in lowered]
+
+    def clear_cache(self):
+        with self._lock:
+            self._verdicts.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+# Process-wide engine, created on first use
+def get_spelling_engine():
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = SpellingEngine()
+    return _engine
+
+
+# Load the dictionary ahead of the first request
+def warm_up():
+    get_spelling_engine().unknown(["warm", "up"])
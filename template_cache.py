@@ -0,0 +1,50 @@
+import copy
+import json
+import threading
+from io import BytesIO
+
+from docx import Document
+
+from metrics import timed
+
+_base_documents = {}
+_lock = threading.Lock()
+
+
+# Returns a fresh, independent Document built from the template's cached base.
+# The base is created once per process by prepare(doc), which sets margins, styles and
+# anything else every CV of that template starts with; each call then only pays for a
+# deep copy instead of unzipping and parsing python-docx's default.docx again.
+def new_document(template_id, prepare):
+    base = _base_documents.get(template_id)
+    if base is None:
+        with _lock:
+            base = _base_documents.get(template_id)
+            if base is None:
+                base = Document()
+                prepare(base)
+                _base_documents[template_id] = base
+    return copy.deepcopy(base)
+
+
+# The body of every template's render(data): build the Document, then serialize it
+def render(build_document, data):
+    buffer = BytesIO()
+    with timed("generate.build"):
+        doc = build_document(data)
+    with timed("generate.save"):
+        doc.save(buffer)
+    return buffer.getvalue()
+
+
+# The body of every template's create_cv_from_json, used when a template module is run as a script
+def save_from_json(build_document, json_file, output_docx):
+    with open(json_file, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    build_document(data).save(output_docx)
+    print(f"CV saved as {output_docx}")
+
+
+def clear():
+    with _lock:
+        _base_documents.clear()
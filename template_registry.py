@@ -0,0 +1,181 @@
+"""Registry of CV layouts reachable from the API and the CLI.
+
+``default`` is the layout in json_to_cv; every ``templates/template_*.py`` module
+is registered under its module name. Modules are only listed at startup and
+imported the first time a CV is rendered with them, so adding templates does not
+slow down boot. Each template exposes ``render(data) -> bytes``.
+
+The default layout can also be rendered by the ``ooxml`` engine (fast_render),
+which writes the document XML directly instead of using python-docx.
+
+Templates do not all read the same JSON: ``default`` takes skill categories and
+a structured job description, ``template_*`` a flat skills list and a plain-text
+description. ``validate`` checks a profile against the chosen template's entry in
+SCHEMAS before anything is rendered.
+"""
+import importlib
+import os
+import pkgutil
+import threading
+
+from metrics import timed
+
+DEFAULT_TEMPLATE = "default"
+DEFAULT_ENGINE = "docx"
+# Engine -> template IDs it can render (None means all of them)
+ENGINES = {
+    "docx": None,
+    "ooxml": {DEFAULT_TEMPLATE},
+}
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+_modules = {}
+_lock = threading.Lock()
+
+
+class UnknownTemplateError(ValueError):
+    """Raised for a template ID that is not registered."""
+
+
+class InvalidCVDataError(ValueError):
+    """Raised when a profile does not fit the JSON schema of the template it is rendered with."""
+
+
+# Field -> expected type; "[x]" is a list of x, a dict a nested object, a tuple of types any of
+# them, and _or_null(x) x or null. Top-level fields may be left out; inside list entries a field
+# is required unless its name ends in "?".
+def _or_null(schema):
+    return (None, schema)
+
+
+_CONTACT = {"name": str, "phone": str, "email": str}
+_EDUCATION = [{"degree": str, "institution": str, "year": str}]
+# The default layout formats these into its text, so numbers read as well as strings
+_FORMATTED = (str, int, float)
+_FLAT_EXPERIENCE = [{"title": str, "company": str, "dates": str, "description": str, "accomplishments?": [str]}]
+_FLAT_SCHEMA = dict(_CONTACT, location=str, summary=str, skills=[str], experience=_FLAT_EXPERIENCE)
+SCHEMAS = {
+    DEFAULT_TEMPLATE: dict(
+        # The sections below the contact line are skipped when empty, so null leaves them out
+        _CONTACT, contact=str, summary=_or_null(str),
+        skills=_or_null([{"category": str, "items": [str]}]),
+        strengths_and_expertise=_or_null([str]),
+        experience=_or_null([{"title": str, "company": str, "dates": str,
+                              "description?": {"intro?": _or_null(str), "details?": _or_null([str])},
+                              "accomplishments?": _or_null([str])}]),
+        education=_or_null([{"degree": _FORMATTED, "institution": _FORMATTED, "year": _FORMATTED}]),
+    ),
+    "template_1": dict(_CONTACT, contact=str, summary=str, skills=[str],
+                       experience=[{"title": str, "company": str, "dates": str, "description": str}],
+                       education=_EDUCATION),
+    "template_2": _FLAT_SCHEMA,
+    "template_3": _FLAT_SCHEMA,
+    "template_4": _FLAT_SCHEMA,
+}
+
+_JSON_TYPES = {str: "a string", int: "a number", float: "a number", list: "a list", dict: "an object"}
+
+
+def _json_type(value):
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "a boolean"
+    if isinstance(value, (int, float)):
+        return "a number"
+    return _JSON_TYPES.get(type(value), type(value).__name__)
+
+
+# Yields (path, problem) for every part of value that does not match the schema
+def _problems(value, schema, path, required=True):
+    if isinstance(schema, tuple) and schema[0] is None:
+        if value is None:
+            return
+        schema = schema[1]
+    if isinstance(schema, list):
+        if not isinstance(value, list):
+            yield path, f"must be a list, not {_json_type(value)}"
+            return
+        for index, item in enumerate(value):
+            yield from _problems(item, schema[0], f"{path}[{index}]")
+    elif isinstance(schema, dict):
+        if not isinstance(value, dict):
+            yield path, f"must be an object, not {_json_type(value)}"
+            return
+        for key, field_schema in schema.items():
+            optional = not required or key.endswith("?")
+            key = key.rstrip("?")
+            field_path = f"{path}.{key}" if path else key
+            if key in value:
+                yield from _problems(value[key], field_schema, field_path)
+            elif not optional:
+                yield field_path, "is missing"
+    elif not isinstance(value, schema) or isinstance(value, bool):
+        expected = dict.fromkeys(_JSON_TYPES[t] for t in (schema if isinstance(schema, tuple) else (schema,)))
+        yield path, f"must be {' or '.join(expected)}, not {_json_type(value)}"
+
+
+def validate(data, template_id=DEFAULT_TEMPLATE):
+    """Raises InvalidCVDataError naming the template and the first missing or mistyped field."""
+    if template_id not in TEMPLATES:
+        raise UnknownTemplateError(f"Unknown template '{template_id}'. Choose one of: {', '.join(TEMPLATES)}")
+    if not isinstance(data, dict):
+        raise InvalidCVDataError(f"The CV JSON must be an object, not {_json_type(data)}.")
+    schema = SCHEMAS.get(template_id)
+    if schema is None:
+        return
+    for path, problem in _problems(data, schema, "", required=False):
+        hint = " See the template schemas in the readme." if template_id != DEFAULT_TEMPLATE else ""
+        raise InvalidCVDataError(f"Template '{template_id}': {path} {problem}.{hint}")
+
+
+# Template ID -> module name; listing the package directory does not import anything
+def _discover():
+    registry = {DEFAULT_TEMPLATE: "json_to_cv"}
+    for module in sorted(pkgutil.iter_modules([TEMPLATES_DIR]), key=lambda m: m.name):
+        if module.name.startswith("template_"):
+            registry[module.name] = f"templates.{module.name}"
+    return registry
+
+
+TEMPLATES = _discover()
+
+
+def available_templates():
+    return list(TEMPLATES)
+
+
+def get_template(template_id):
+    """Returns the template module, importing it on first use."""
+    if template_id not in TEMPLATES:
+        raise UnknownTemplateError(f"Unknown template '{template_id}'. Choose one of: {', '.join(TEMPLATES)}")
+    module = _modules.get(template_id)
+    if module is None:
+        with _lock:
+            module = _modules.get(template_id)
+            if module is None:
+                module = importlib.import_module(TEMPLATES[template_id])
+                _modules[template_id] = module
+    return module
+
+
+def check_engine(template_id, engine):
+    """Raises UnknownTemplateError unless the engine can render the template."""
+    if engine not in ENGINES:
+        raise UnknownTemplateError(f"Unknown engine '{engine}'. Choose one of: {', '.join(ENGINES)}")
+    if template_id not in TEMPLATES:
+        raise UnknownTemplateError(f"Unknown template '{template_id}'. Choose one of: {', '.join(TEMPLATES)}")
+    supported = ENGINES[engine]
+    if supported is not None and template_id not in supported:
+        raise UnknownTemplateError(f"The {engine} engine only supports: {', '.join(sorted(supported))}")
+
+
+def render(data, template_id=DEFAULT_TEMPLATE, engine=DEFAULT_ENGINE):
+    """Renders data with the given template and engine and returns the DOCX bytes."""
+    check_engine(template_id, engine)
+    validate(data, template_id)
+    with timed(f"render.{template_id}.{engine}"):
+        if engine == "ooxml":
+            import fast_render
+            return fast_render.render(data)
+        return get_template(template_id).render(data)
@@ -1,19 +1,12 @@
-import json
-from docx import Document
 from docx.shared import Pt
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
 import os
+import template_cache
 
-def create_cv_from_json(json_file, output_docx):
-    # Load JSON data
-    with open(json_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    # Create a new Word document
-    doc = Document()
-
+def apply_base_style(doc):
+    """Sets the narrow margins and the Arial 10.5pt Normal style every CV of this template starts with."""
     # Set custom margins (slightly more padding on the left and right)
     sections = doc.sections
     for section in sections:
@@ -27,6 +20,11 @@ def create_cv_from_json(json_file, output_docx):
     style.font.name = 'Arial'
     style.font.size = Pt(10.5)  # Use a smaller font size for compactness
 
+def build_document(data):
+    """Builds this template's CV layout and returns the unsaved Document."""
+    # Start from a copy of the cached, pre-styled base document
+    doc = template_cache.new_document("template_1", apply_base_style)
+
     # Add name as the title
     title = doc.add_heading(level=1)
     run = title.add_run(data.get("name", "Your Name"))
@@ -81,9 +79,13 @@ def create_cv_from_json(json_file, output_docx):
             run.bold = True
         skills_paragraph.paragraph_format.space_after = Pt(0)  # Reduce space after skills section
 
-    # Save the document
-    doc.save(output_docx)
-    print(f"CV saved as {output_docx}")
+    return doc
+
+def render(data):
+    return template_cache.render(build_document, data)
+
+def create_cv_from_json(json_file, output_docx):
+    template_cache.save_from_json(build_document, json_file, output_docx)
 
 if __name__ == "__main__":
     input_json = os.getenv("INPUT_JSON", "cv_data.json")
@@ -1,8 +1,7 @@
-import json
-from docx import Document
 from docx.shared import Pt, Inches
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
 import os
+import template_cache
 
 def add_horizontal_line(doc):
     """Adds a single horizontal line to the document."""
@@ -61,11 +60,8 @@ def add_experience_section(doc, experience):
                 bullet = doc.add_paragraph("• " + acc)
                 bullet.paragraph_format.space_after = Pt(0)
 
-def create_cv_from_json(json_file, output_docx):
-    with open(json_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    doc = Document()
+def apply_base_style(doc):
+    """Sets the page margins and the Arial 10.5pt Normal style every CV of this template starts with."""
     sections = doc.sections
     for section in sections:
         section.top_margin = Inches(0.5)
@@ -76,6 +72,10 @@ def create_cv_from_json(json_file, output_docx):
     style = doc.styles['Normal']
     style.font.name = 'Arial'
     style.font.size = Pt(10.5)
+
+def build_document(data):
+    """Builds this template's CV layout and returns the unsaved Document."""
+    doc = template_cache.new_document("template_4", apply_base_style)
     
     # Name at the top
     name = doc.add_paragraph()
@@ -100,8 +100,13 @@ def create_cv_from_json(json_file, output_docx):
     
     add_experience_section(doc, data.get("experience", []))
     
-    doc.save(output_docx)
-    print(f"CV saved as {output_docx}")
+    return doc
+
+def render(data):
+    return template_cache.render(build_document, data)
+
+def create_cv_from_json(json_file, output_docx):
+    template_cache.save_from_json(build_document, json_file, output_docx)
 
 if __name__ == "__main__":
     input_json = os.getenv("INPUT_JSON", "cv_data.json")
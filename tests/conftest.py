@@ -0,0 +1,7 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXAMPLE_JSON = os.path.join(ROOT, "cv_data.example.json")
+
+sys.path.insert(0, ROOT)
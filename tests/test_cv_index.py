@@ -0,0 +1,52 @@
+"""CVs in the index are keyed by server-generated IDs, never by label or text alone."""
+from cv_index import CVIndex
+
+PYTHON = "Python developer with Django and PostgreSQL experience"
+JAVA = "Java developer with Spring and Kafka experience"
+
+
+def test_same_label_keeps_both(tmp_path):
+    index = CVIndex(str(tmp_path / "index.db"))
+    first, second = index.add_many([("resume.docx", PYTHON), ("resume.docx", JAVA)])
+    assert first != second
+    assert index.stats()["documents"] == 2
+    assert {c.id for c in index.rank("developer experience")} == {first, second}
+
+
+def test_same_text_keeps_other_label(tmp_path):
+    index = CVIndex(str(tmp_path / "index.db"))
+    alice = index.add("alice", PYTHON)
+    bob = index.add("bob", PYTHON)
+    assert alice != bob
+    assert index.add("alice", PYTHON) == alice
+    assert sorted(c.label for c in index.rank("python django")) == ["alice", "bob"]
+
+
+def test_replace_and_remove_by_id(tmp_path):
+    index = CVIndex(str(tmp_path / "index.db"))
+    cv_id, other = index.add_many([("resume.docx", PYTHON), ("resume.docx", PYTHON + " and Flask")])
+    assert index.replace(cv_id, "resume.docx", JAVA)
+    assert [c.id for c in index.rank("spring kafka")] == [cv_id]
+    assert [c.id for c in index.rank("django")] == [other]
+    assert not index.replace("unknown", "resume.docx", JAVA)
+    assert index.remove(cv_id) and not index.remove(cv_id)
+    index.optimize()
+    assert index.stats()["documents"] == 1
+
+
+def test_rank_reads_one_snapshot(tmp_path):
+    path = str(tmp_path / "index.db")
+    reader, writer = CVIndex(path), CVIndex(path)
+    first = reader.add("alice", PYTHON)
+    load_documents = reader._load_documents
+
+    # Another process adds a CV between the reader loading the documents and their postings
+    def load_then_write():
+        loaded = load_documents()
+        writer.add("bob", PYTHON + " and Flask")
+        return loaded
+
+    reader._load_documents = load_then_write
+    assert [c.id for c in reader.rank("python django")] == [first]
+    del reader._load_documents
+    assert len(reader.rank("python django")) == 2
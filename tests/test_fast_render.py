@@ -0,0 +1,47 @@
+"""The OOXML fast renderer must produce byte-identical packages to json_to_cv."""
+import copy
+import json
+import zipfile
+from io import BytesIO
+
+import pytest
+
+import fast_render
+import json_to_cv
+from conftest import EXAMPLE_JSON
+
+
+def example():
+    with open(EXAMPLE_JSON, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def edge_cases():
+    edge = example()
+    edge["summary"] = ""
+    edge["strengths_and_expertise"] = ["R&D <lead>", " padded ", "tab\there", "line\nbreak\r\nagain"]
+    edge["skills"] = [{"category": "Empty", "items": []}] + edge["skills"]
+    edge["experience"].append({"title": "Intern", "company": "\"Quotes\" & Co", "dates": "", "description": {},
+                               "accomplishments": ["Shipped it's first release"]})
+    return edge
+
+
+def long_profile(jobs=20):
+    data = example()
+    data["experience"] = [copy.deepcopy(data["experience"][i % 2]) for i in range(jobs)]
+    for job in data["experience"]:
+        job["description"]["details"] = job["description"]["details"] * 5
+    return data
+
+
+PROFILES = {"example": example, "edge cases": edge_cases, "20 jobs": long_profile, "empty": dict}
+
+
+@pytest.mark.parametrize("label", list(PROFILES))
+def test_parts_are_byte_identical(label):
+    data = PROFILES[label]()
+    expected = zipfile.ZipFile(BytesIO(json_to_cv.render(data)))
+    actual = zipfile.ZipFile(BytesIO(fast_render.render(data)))
+    assert actual.namelist() == expected.namelist()
+    different = [name for name in expected.namelist() if expected.read(name) != actual.read(name)]
+    assert not different, f"parts differ: {', '.join(different)}"
@@ -0,0 +1,47 @@
+"""Importing the app must stay offline, leave the heavy dependencies for first use and fit its time budget."""
+import statistics
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.import_budget import BUDGETS_MS, import_time_ms
+from conftest import ROOT
+
+# CI machines are slower and noisier than a workstation; the budget still catches an eager heavy import
+BUDGET_SLACK = 1.5
+
+# Dependencies that must only be imported on first use (api.warm_up loads them on purpose)
+LAZY_MODULES = {
+    "api": ["ats_analysis", "spelling", "spellchecker", "nltk", "docx", "lxml", "json_to_cv", "numpy", "scipy"],
+    "ats_analysis": ["nltk", "docx"],
+    "tokenizer": ["nltk"],
+    "nltk_resources": ["nltk"],
+}
+
+# Any lookup or connection attempt during import fails the run, even if the caller swallows the error
+NO_NETWORK = (
+    "import socket, sys\n"
+    "_attempts = []\n"
+    "def _blocked(*args, **kwargs):\n"
+    "    _attempts.append(args)\n"
+    "    raise OSError('network access during import')\n"
+    "socket.getaddrinfo = socket.socket.connect = socket.socket.connect_ex = _blocked\n"
+)
+
+
+@pytest.mark.parametrize("module", sorted(LAZY_MODULES))
+def test_import_is_offline_and_lazy(module):
+    script = (f"{NO_NETWORK}import {module}\n"
+              "if _attempts: sys.exit('network access attempted during import')\n"
+              f"_eager = [name for name in {LAZY_MODULES[module]!r} if name in sys.modules]\n"
+              "if _eager: sys.exit('imported eagerly: ' + ', '.join(_eager))\n")
+    proc = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS_MS))
+def test_import_time_within_budget(module):
+    median = statistics.median(import_time_ms(module) for _ in range(3))
+    budget = BUDGETS_MS[module] * BUDGET_SLACK
+    assert median <= budget, f"import {module} took {median:.0f} ms (median of 3), budget {budget:.0f} ms"
@@ -0,0 +1,49 @@
+"""Profiles are checked against the schema of the template they are rendered with."""
+import json
+
+import pytest
+
+import template_registry
+from conftest import EXAMPLE_JSON
+
+
+def example():
+    with open(EXAMPLE_JSON, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_example_fits_default():
+    template_registry.validate(example(), "default")
+
+
+@pytest.mark.parametrize("template_id", ["template_1", "template_2", "template_3", "template_4"])
+def test_default_profile_rejected_by_flat_templates(template_id):
+    with pytest.raises(template_registry.InvalidCVDataError, match=f"'{template_id}': skills\\[0\\] must be a string"):
+        template_registry.validate(example(), template_id)
+
+
+def test_flat_profile_fits_flat_templates():
+    data = {"name": "A", "location": "B", "skills": ["Python"],
+            "experience": [{"title": "T", "company": "C", "dates": "2020", "description": "D"}]}
+    template_registry.validate(data, "template_2")
+    del data["experience"][0]["description"]
+    with pytest.raises(template_registry.InvalidCVDataError, match="experience\\[0\\].description is missing"):
+        template_registry.validate(data, "template_2")
+
+
+def test_default_accepts_what_its_layout_renders():
+    data = example()
+    data["education"] = [{"degree": "BSc", "institution": "Uni", "year": 2018}]
+    data["summary"] = None
+    data["skills"] = None
+    template_registry.validate(data, "default")
+    assert template_registry.render(data, "default")[:2] == b"PK"
+
+
+def test_default_still_rejects_mistyped_fields():
+    data = example()
+    data["education"] = [{"degree": "BSc", "institution": "Uni", "year": True}]
+    with pytest.raises(template_registry.InvalidCVDataError, match="year must be a string or a number, not a boolean"):
+        template_registry.validate(data, "default")
+    with pytest.raises(template_registry.InvalidCVDataError, match="name must be a string, not null"):
+        template_registry.validate({"name": None}, "default")
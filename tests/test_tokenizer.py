@@ -0,0 +1,22 @@
+"""The regex tokenizer must give the same tokens as nltk.word_tokenize.
+
+tokenizer_cases.json holds NLTK's output for the sample CVs and for text that
+exercises abbreviations, contractions, quotes and numbers, so the comparison runs
+without the NLTK data files. NLTK's rewritten double quotes (``, '') are compared
+as the plain quote the regex tokenizer keeps.
+"""
+import json
+import os
+
+import pytest
+
+from tokenizer import RegexTokenizer
+
+with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "tokenizer_cases.json"), encoding="utf-8") as f:
+    CASES = json.load(f)
+
+
+@pytest.mark.parametrize("case", CASES, ids=[case["text"][:30] for case in CASES])
+def test_matches_nltk(case):
+    expected = ['"' if token in ("``", "''") else token for token in case["tokens"]]
+    assert RegexTokenizer().tokenize(case["text"]) == expected
@@ -0,0 +1,91 @@
+"""Word tokenizers used by the ATS checks.
+
+The default is a single compiled regular expression that splits text the way
+``nltk.word_tokenize`` does for CV-style prose (words, hyphenated terms, dotted
+names such as ``Node.js``, numbers, contractions and stand-alone punctuation).
+A period is split off only where Punkt would end a sentence, so abbreviations
+such as ``Ltd.`` and ``e.g.`` stay whole. The one difference in output is that
+NLTK rewrites double quotes as pairs of backticks or single quotes; here they
+stay as they are.
+Set ``CV_TOKENIZER=nltk`` to use NLTK's Punkt/Treebank tokenizer instead.
+"""
+import os
+import re
+
+# Characters that always end a token; everything else (hyphens, slashes, "+", "•") stays inside it
+_DELIMITERS = r"\s.,;:!?()\[\]{}<>\"'`@#$%&*«»“”‘’„\u2012-\u2015"
+_CLITICS = r"(?:s|re|ve|ll|d|m)\b"
+# What may follow a period for Punkt to consider a sentence break there
+_AFTER_PERIOD = r"\s?!)\";}\]*:@'({\["
+# Abbreviations Punkt's English model knows, so their period does not end a sentence
+ABBREVIATIONS = [
+    "a.m", "p.m", "e.g", "i.e", "etc", "vs", "approx", "dept", "mr", "mrs", "ms", "dr", "prof", "jr", "sr", "st",
+    "inc", "corp", "co", "ltd", "bros", "u.s", "u.k", "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep",
+    "sept", "oct", "nov", "dec",
+]
+_WORD = rf"[^{_DELIMITERS}]+(?:(?:\.|[,:](?=\d)|'(?!{_CLITICS}|t\b))[^{_DELIMITERS}]+)*"
+# The period just matched ends an abbreviation (possibly after a hyphen: "Acme-Corp.") or an initial ("J.")
+_ABBREVIATED = "|".join(
+    [rf"(?<={re.escape(word)}\.)(?<![^{_DELIMITERS}-]{re.escape(word)}\.)" for word in ABBREVIATIONS]
+    + [rf"(?<=[^\W\d_]\.)(?<![^{_DELIMITERS}]..)"]
+)
+# Only the last period of the text (before any closing quotes or brackets) is certain to end a sentence
+_NOT_LAST = r"(?!['\"\])}>»”’]*\s*$)"
+
+TOKEN_PATTERN = re.compile(
+    r"\b(?=[cdglmw])(?:can(?=not\b)|gim(?=me\b)|gon(?=na\b)|got(?=ta\b)|lem(?=me\b)|wan(?=na\s)|d(?='ye\b)|more(?='n\b))"
+    r"|'(?:(?<=\bd')ye|(?<=\bmore')n)\b"            # "can not", "gon na", ... like NLTK
+    rf"|[^{_DELIMITERS}]+?(?=n't\b)"                 # "do" in "don't"
+    rf"|n't\b"
+    rf"|'{_CLITICS}"                                # "'s", "'re", ... split off like the Treebank tokenizer
+    rf"|(?=-?\d)(?<![^{_DELIMITERS}])-?\d[\d,.-]*\.(?=\s+(?-i:[a-z]))"  # a number's period before a lowercase word
+    rf"|{_WORD}"                                    # words, incl. "full-stack", "UI/UX", "Node.js", "1,000", "O'Brien"
+    # A token-final period stays where Punkt would not end a sentence: before "," and the like,
+    # and after abbreviations and initials unless it is the last one in the text
+    rf"(?:\.(?:(?=[^{_AFTER_PERIOD}.])|(?:{_ABBREVIATED}){_NOT_LAST}))?"
+    r"|\.{2,}|\S",                                 # ellipsis and any other single character
+    re.IGNORECASE,
+)
+
+
+class RegexTokenizer:
+    name = "regex"
+
+    def tokenize(self, text):
+        return TOKEN_PATTERN.findall(text)
+
+
+class NltkTokenizer:
+    name = "nltk"
+
+    def __init__(self):
+        import nltk_resources
+        nltk_resources.configure()
+        from nltk.tokenize import word_tokenize
+        self._word_tokenize = word_tokenize
+
+    def tokenize(self, text):
+        return self._word_tokenize(text)
+
+
+TOKENIZERS = {
+    RegexTokenizer.name: RegexTokenizer,
+    NltkTokenizer.name: NltkTokenizer,
+}
+
+_tokenizer = None
+
+
+# Tokenizer selected by CV_TOKENIZER, created on first use
+def get_tokenizer():
+    global _tokenizer
+    if _tokenizer is None:
+        name = os.getenv("CV_TOKENIZER", RegexTokenizer.name)
+        if name not in TOKENIZERS:
+            raise ValueError(f"Unknown tokenizer '{name}'. Choose one of: {', '.join(TOKENIZERS)}")
+        _tokenizer = TOKENIZERS[name]()
+    return _tokenizer
+
+
+def tokenize(text):
+    return get_tokenizer().tokenize(text)
@@ -0,0 +1,134 @@
+"""Bounded ingestion of uploaded files.
+
+Oversized request bodies are refused by ``MaxBodySizeMiddleware`` while they are
+still arriving, before Starlette spools them. ``read_upload`` then reads the
+spooled file in chunks, rejecting anything that does not start like a ZIP
+archive on the first chunk and stopping as soon as the size limit is passed, so
+a request never holds more than ``max_bytes`` (plus one chunk) of an upload in
+memory. ``cv_upload_buffered_bytes`` shows how much is held right now.
+"""
+import metrics
+
+CHUNK_SIZE = 64 * 1024
+# Every DOCX (and every ZIP archive) starts with a local file header
+ZIP_MAGIC = b"PK\x03\x04"
+
+UPLOAD_BYTES = metrics.Histogram(
+    "cv_upload_bytes", "Size of accepted uploads.",
+    buckets=(16 * 1024, 64 * 1024, 256 * 1024, 1024 ** 2, 4 * 1024 ** 2, 16 * 1024 ** 2, 64 * 1024 ** 2))
+BUFFERED_BYTES = metrics.Gauge("cv_upload_buffered_bytes", "Upload bytes currently held in memory by handlers.")
+REJECTED = metrics.Counter("cv_uploads_rejected_total", "Uploads refused before being fully read.", ["reason"])
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload is bigger than allowed."""
+
+
+class InvalidUploadError(ValueError):
+    """Raised when an upload does not look like the expected file type."""
+
+
+def size_label(max_bytes):
+    return f"{max_bytes / 1024 / 1024:.0f}MB"
+
+
+async def read_upload(upload, max_bytes, magic=ZIP_MAGIC, chunk_size=CHUNK_SIZE):
+    """Reads an UploadFile in chunks and returns its bytes.
+
+    Raises InvalidUploadError when the first bytes are not ``magic`` and UploadTooLargeError
+    as soon as more than ``max_bytes`` have been read.
+    """
+    buffer = bytearray()
+    try:
+        while True:
+            chunk = await upload.read(chunk_size)
+            if not chunk:
+                break
+            if not buffer and magic and not chunk.startswith(magic[:len(chunk)]):
+                REJECTED.inc(reason="magic")
+                raise InvalidUploadError("File content is not a DOCX (ZIP) document.")
+            buffer += chunk
+            BUFFERED_BYTES.inc(len(chunk))
+            if len(buffer) > max_bytes:
+                REJECTED.inc(reason="size")
+                raise UploadTooLargeError(f"File too large. Max allowed size is {size_label(max_bytes)}.")
+        if magic and len(buffer) < len(magic):
+            REJECTED.inc(reason="magic")
+            raise InvalidUploadError("File content is not a DOCX (ZIP) document.")
+        UPLOAD_BYTES.observe(len(buffer))
+        return bytes(buffer)
+    finally:
+        BUFFERED_BYTES.dec(len(buffer))
+
+
+class MaxBodySizeMiddleware:
+    """ASGI middleware answering 413 once a request body to one of ``limits``' paths exceeds its size.
+
+    A Content-Length over the limit is refused without reading anything; chunked bodies
+    are counted as they arrive and cut off at the limit.
+    """
+
+    def __init__(self, app, limits):
+        self.app = app
+        self.limits = dict(limits)
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        try:
+            declared = int(headers.get(b"content-length", b"0"))
+        except ValueError:
+            declared = 0
+        if declared > limit:
+            REJECTED.inc(reason="size")
+            await self._reject(send, limit)
+            return
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    exceeded = True
+                    raise UploadTooLargeError(f"Request body too large. Max allowed size is {size_label(limit)}.")
+            return message
+
+        # FastAPI turns errors while parsing a form into a 400; answer 413 in its place
+        async def guarded_send(message):
+            nonlocal response_started
+            if exceeded:
+                if message["type"] == "http.response.start" and not response_started:
+                    response_started = True
+                    REJECTED.inc(reason="size")
+                    await self._reject(send, limit)
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except UploadTooLargeError:
+            if not response_started:
+                REJECTED.inc(reason="size")
+                await self._reject(send, limit)
+
+    @staticmethod
+    async def _reject(send, limit):
+        body = f'{{"detail": "Request body too large. Max allowed size is {size_label(limit)}."}}'.encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()),
+                        (b"connection", b"close")],
+        })
+        await send({"type": "http.response.body", "body": body})
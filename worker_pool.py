@@ -0,0 +1,87 @@
+import asyncio
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import metrics
+
+
+class PoolSaturatedError(RuntimeError):
+    """Raised when the worker pool already holds as many jobs as it is allowed to queue."""
+
+
+# Runs once in every worker process so the first job does not pay for loading dictionaries and templates
+def _init_worker():
+    import fast_render
+    import json_to_cv
+    import spelling
+    import tokenizer
+    spelling.warm_up()
+    tokenizer.get_tokenizer()
+    json_to_cv.warm_up()
+    fast_render.warm_up()
+
+
+def _noop():
+    pass
+
+
+# Runs in the worker; the stage timings it took travel back with the result
+def _call_collecting(fn, args, kwargs):
+    with metrics.collect() as stages:
+        result = fn(*args, **kwargs)
+    return result, stages
+
+
+class WorkerPool:
+    """Process pool for CPU-bound CV generation and analysis, with a bounded backlog.
+
+    At most ``max_workers`` jobs run at once and at most ``max_queue`` more wait for
+    a free worker; anything beyond that is rejected with PoolSaturatedError so the
+    caller can answer 503 instead of piling up work. ``max_workers=0`` runs jobs in
+    the event loop's default thread pool, which is handy for development.
+    """
+
+    def __init__(self, max_workers, max_queue, initializer=_init_worker):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._initializer = initializer
+        self._executor = None
+        self.pending = 0
+
+    @classmethod
+    def from_env(cls):
+        max_workers = int(os.getenv("CV_WORKERS", os.cpu_count() or 1))
+        max_queue = int(os.getenv("CV_MAX_QUEUE", max(max_workers, 1) * 4))
+        return cls(max_workers, max_queue)
+
+    def start(self):
+        """Starts the worker processes and waits until each has run the initializer."""
+        if self._executor is None and self.max_workers > 0:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=self._initializer)
+            # ProcessPoolExecutor only starts processes when work arrives, which would leave the
+            # initializer on the first request's path
+            for future in [self._executor.submit(_noop) for _ in range(self.max_workers)]:
+                future.result()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, fn, *args, **kwargs):
+        """Runs fn(*args, **kwargs) on a worker and returns its result."""
+        if self.pending >= max(self.max_workers, 1) + self.max_queue:
+            raise PoolSaturatedError("Server is busy, please retry shortly.")
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            # Includes the time spent waiting for a free worker
+            with metrics.timed(f"pool.{fn.__name__}"):
+                result, stages = await loop.run_in_executor(
+                    self._executor, functools.partial(_call_collecting, fn, args, kwargs))
+            metrics.record_stages(stages)
+            return result
+        finally:
+            self.pending -= 1